@@ -3,24 +3,86 @@ App Switching Integration Module
 Handles setup of app switching between GUI applications
 """
 
+import mmap
 import os
+import pwd
 import subprocess
 import shutil
 import tempfile
+from functools import lru_cache
+from pathlib import Path
 import config
 from utils.logger import logger_instance as log
 from utils.error_handler import handle_error
 
-def get_app_switch_path():
-    """Get the path to the app_switch.py script using the DYS_RPI environment variable"""
-    dys_rpi = os.environ.get('DYS_RPI')
-    if dys_rpi:
-        return os.path.join(dys_rpi, "scripts", "app_switch.py")
-    else:
-        # If DYS_RPI is not set, use the absolute path
-        script_dir = os.path.dirname(os.path.abspath(__file__))
-        project_dir = os.path.dirname(script_dir)
-        return os.path.join(project_dir, "scripts", "app_switch.py")
+# RetroPie port script that launches an app through app_switch.py
+PORT_SCRIPT_TEMPLATE = """#!/bin/bash
+# Script to launch {display_name} from RetroPie
+python3 ${{DYS_RPI}}/scripts/app_switch.py {app_name}
+"""
+
+@lru_cache(maxsize=None)
+def get_project_dir():
+    """Get the absolute path of the project directory (the parent of modules/)"""
+    return os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+@lru_cache(maxsize=None)
+def user_ids(user):
+    """Return the (uid, gid) pair of a user, resolved once per process"""
+    user_info = pwd.getpwnam(user)
+    return user_info.pw_uid, user_info.pw_gid
+
+def chown_to_user(path, user):
+    """
+    Give a single path to the user and their primary group without spawning chown
+
+    Nothing is done when not running as root (ownership cannot be given away)
+    or when the path is already owned by the user.
+    """
+    if os.geteuid() != 0:
+        return
+    uid, gid = user_ids(user)
+    stat_info = os.stat(path)
+    if stat_info.st_uid != uid or stat_info.st_gid != gid:
+        os.chown(path, uid, gid)
+
+def write_file_atomic(path, data):
+    """
+    Write bytes to a file through a sibling temp file and os.replace
+
+    Readers never see a half-written file, and the data is written with a
+    single write call. An existing file's permission bits are carried over.
+    """
+    temp_path = f"{path}.tmp"
+    Path(temp_path).write_bytes(data)
+    if os.path.exists(path):
+        shutil.copymode(path, temp_path)
+    os.replace(temp_path, path)
+
+def file_contains(path, needle):
+    """
+    Check whether a file contains a byte string without reading it into memory
+
+    The file is memory-mapped and searched in place; empty files never match.
+    """
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return False
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            return mapped.find(needle) != -1
+
+def list_file_names(directory):
+    """
+    Return the names of the regular files in a directory
+
+    Uses a single os.scandir walk so callers can test membership instead of
+    stat-ing each candidate path. A missing directory yields an empty set.
+    """
+    try:
+        with os.scandir(directory) as entries:
+            return {entry.name for entry in entries if entry.is_file()}
+    except OSError:
+        return set()
 
 @handle_error(exit_on_error=False)
 def install_kodi_addon():
@@ -39,8 +101,7 @@ def install_kodi_addon():
         user = config.USER
 
         # Get the addon source directory
-        script_dir = os.path.dirname(os.path.abspath(__file__))
-        project_dir = os.path.dirname(script_dir)
+        project_dir = get_project_dir()
         addon_source_dir = os.path.join(project_dir, "addons", "script.switcher")
 
         if not os.path.exists(addon_source_dir):
@@ -60,13 +121,13 @@ def install_kodi_addon():
                 dir_path = os.path.join(kodi_dir, subdir)
                 os.makedirs(dir_path, exist_ok=True)
                 # Set proper ownership immediately
-                subprocess.run(["chown", f"{user}:{user}", dir_path], check=True)
+                chown_to_user(dir_path, user)
             log.info(f"✅ Created Kodi directory structure with proper ownership")
         else:
             # Just ensure the addon directory exists
             os.makedirs(os.path.dirname(kodi_addon_dir), exist_ok=True)
             # Make sure it has proper ownership
-            subprocess.run(["chown", f"{user}:{user}", os.path.dirname(kodi_addon_dir)], check=True)
+            chown_to_user(os.path.dirname(kodi_addon_dir), user)
 
         # Check if addon already exists
         if os.path.exists(kodi_addon_dir):
@@ -92,7 +153,7 @@ def install_kodi_addon():
             settings_path = os.path.join(addon_data_dir, "settings.xml")
             with open(settings_path, "w") as f:
                 f.write('<?xml version="1.0" encoding="utf-8" standalone="yes"?>\n<settings>\n</settings>')
-            subprocess.run(["chown", f"{user}:{user}", settings_path], check=True)
+            chown_to_user(settings_path, user)
 
             # Run the enable_addon.py script to update Kodi's database
             enable_script = os.path.join(kodi_addon_dir, "enable_addon_improved.py")
@@ -180,9 +241,8 @@ def install_services():
     Set up app switching scripts using the DYS_RPI environment variable
     """
     with log.log_section("Setting up app switching scripts"):
-        # Get the script directory
-        script_dir = os.path.dirname(os.path.abspath(__file__))
-        project_dir = os.path.dirname(script_dir)
+        # Get the scripts directory
+        project_dir = get_project_dir()
         scripts_dir = os.path.join(project_dir, "scripts")
 
         # List of scripts to check
@@ -210,23 +270,27 @@ def install_services():
 def create_desktop_shortcuts(gui_apps):
     """Create desktop shortcuts for easy switching with custom icons"""
     with log.log_section("Creating desktop shortcuts"):
-        # Get the script directory
-        script_dir = os.path.dirname(os.path.abspath(__file__))
-
         # Get user and project directory
         user = config.USER
-        project_dir = os.path.dirname(script_dir)
+        project_dir = get_project_dir()
         media_dir = os.path.join(project_dir, "media")
 
+        # Get the path to the desktop files in media/icons
+        desktop_files_dir = os.path.join(project_dir, "media", "icons")
+
+        # List each source directory once instead of stat-ing every candidate file
+        media_files = list_file_names(media_dir)
+        desktop_files = list_file_names(desktop_files_dir)
+
         # Verify that media directory exists
-        if not os.path.exists(media_dir):
+        if not os.path.isdir(media_dir):
             log.warning(f"⚠️ Media directory not found at {media_dir}")
 
         # Verify that icons exist in the media directory
         for app_name in gui_apps.keys():
             icon_file = f"{app_name}.png"
             icon_path = os.path.join(media_dir, icon_file)
-            if not os.path.exists(icon_path):
+            if icon_file not in media_files:
                 log.warning(f"⚠️ Icon for {app_name} not found at {icon_path}")
             else:
                 log.info(f"✅ Found icon for {app_name} at {icon_path}")
@@ -238,7 +302,7 @@ def create_desktop_shortcuts(gui_apps):
 
         # Create user's desktop directory if it doesn't exist
         os.makedirs(user_desktop_dir, exist_ok=True)
-        subprocess.run(["chown", f"{user}:{user}", user_desktop_dir], check=True)
+        chown_to_user(user_desktop_dir, user)
 
         # Create root's desktop directory if it doesn't exist
         try:
@@ -247,22 +311,18 @@ def create_desktop_shortcuts(gui_apps):
         except Exception as e:
             log.warning(f"⚠️ Failed to create root desktop directory: {e}")
 
-        # Get the path to the desktop files in media/icons
-        desktop_files_dir = os.path.join(project_dir, "media", "icons")
-
         for app_name in gui_apps.keys():
             desktop_file = f"{app_name}.desktop"
             source_desktop_file = os.path.join(desktop_files_dir, desktop_file)
 
             # Check if the desktop file exists in media/icons
-            if not os.path.exists(source_desktop_file):
+            if desktop_file not in desktop_files:
                 log.warning(f"⚠️ Desktop file for {app_name} not found at {source_desktop_file}")
                 continue
 
             # Read the desktop file content
             try:
-                with open(source_desktop_file, 'r') as f:
-                    desktop_content = f.read()
+                desktop_content = Path(source_desktop_file).read_bytes()
                 log.info(f"✅ Found desktop file for {app_name} at {source_desktop_file}")
             except Exception as e:
                 log.error(f"❌ Failed to read desktop file for {app_name}: {e}")
@@ -271,11 +331,10 @@ def create_desktop_shortcuts(gui_apps):
             # 1. Create in system applications directory (requires root)
             system_destination = os.path.join(applications_dir, desktop_file)
             try:
-                with open(system_destination, 'w') as f:
-                    f.write(desktop_content)
+                write_file_atomic(system_destination, desktop_content)
 
                 # Set permissions for system file (readable by all, writable by root)
-                subprocess.run(["chmod", "644", system_destination], check=True)
+                os.chmod(system_destination, 0o644)
 
                 log.info(f"Created system desktop file at {system_destination}")
             except Exception as e:
@@ -285,12 +344,11 @@ def create_desktop_shortcuts(gui_apps):
             # 2. Create in user's desktop directory
             user_destination = os.path.join(user_desktop_dir, desktop_file)
             try:
-                with open(user_destination, 'w') as f:
-                    f.write(desktop_content)
+                write_file_atomic(user_destination, desktop_content)
 
                 # Set proper ownership and permissions
-                subprocess.run(["chown", f"{user}:{user}", user_destination], check=True)
-                subprocess.run(["chmod", "755", user_destination], check=True)
+                chown_to_user(user_destination, user)
+                os.chmod(user_destination, 0o755)
 
                 log.info(f"Created user desktop file at {user_destination}")
             except Exception as e:
@@ -300,16 +358,12 @@ def create_desktop_shortcuts(gui_apps):
             # 3. Create in root's desktop directory with absolute paths
             root_destination = os.path.join(root_desktop_dir, desktop_file)
             try:
-                # Get the absolute path to the project directory
-                script_dir = os.path.dirname(os.path.abspath(__file__))
-                project_dir = os.path.dirname(script_dir)
-
                 # Create a modified version of the desktop file with absolute paths for root
                 # Replace ${DYS_RPI} with the actual project directory path
-                root_desktop_content = desktop_content.replace("${DYS_RPI}", project_dir)
+                root_desktop_content = desktop_content.replace(b"${DYS_RPI}", project_dir.encode())
 
                 # We need to use sudo to write to root's desktop
-                with tempfile.NamedTemporaryFile(mode='w', delete=False) as temp_file:
+                with tempfile.NamedTemporaryFile(delete=False) as temp_file:
                     temp_file.write(root_desktop_content)
                     temp_path = temp_file.name
 
@@ -341,19 +395,18 @@ def ensure_es_systems_config(user):
         return False
 
     try:
-        # Read the current config
-        with open(es_config_path, 'r') as f:
-            content = f.read()
+        # On re-runs the ports system is normally present already; probe without reading
+        if file_contains(es_config_path, b"<name>ports</name>"):
+            log.info("EmulationStation config already includes ports")
+            return True
 
-        # Check if we need to modify the file
-        modified = False
+        # Read the current config as bytes; it is only spliced
+        content = Path(es_config_path).read_bytes()
 
-        # Check for ports system
-        if "<name>ports</name>" not in content:
-            log.info("Adding ports system to EmulationStation config")
+        log.info("Adding ports system to EmulationStation config")
 
-            # Create ports system definition
-            ports_system = f"""  <system>
+        # Create ports system definition
+        ports_system = f"""  <system>
     <name>ports</name>
     <fullname>Ports</fullname>
     <path>/home/{user}/RetroPie/roms/ports</path>
@@ -363,27 +416,18 @@ def ensure_es_systems_config(user):
     <theme>ports</theme>
   </system>
 """
-            # Add before the closing tag
-            content = content.replace("</systemList>", ports_system + "</systemList>")
-            modified = True
-
+        # Add before the closing tag
+        content = content.replace(b"</systemList>", ports_system.encode() + b"</systemList>")
 
-        # Write the updated config if modified
-        if modified:
-            # Create a backup first
-            backup_path = f"{es_config_path}.bak"
-            shutil.copy2(es_config_path, backup_path)
-            log.info(f"Created backup of EmulationStation config at {backup_path}")
+        # Create a backup first
+        backup_path = f"{es_config_path}.bak"
+        shutil.copy2(es_config_path, backup_path)
+        log.info(f"Created backup of EmulationStation config at {backup_path}")
 
-            with open(es_config_path, 'w') as f:
-                f.write(content)
+        write_file_atomic(es_config_path, content)
 
-            log.info("✅ Updated EmulationStation configuration")
-
-            return True
-        else:
-            log.info("EmulationStation config already includes ports")
-            return True
+        log.info("✅ Updated EmulationStation configuration")
+        return True
 
     except Exception as e:
         log.error(f"Failed to update EmulationStation config: {e}")
@@ -397,8 +441,7 @@ def integrate_with_retropie(gui_apps):
         user = config.USER
 
         # Get the project directory for icons
-        script_dir = os.path.dirname(os.path.abspath(__file__))
-        project_dir = os.path.dirname(script_dir)
+        project_dir = get_project_dir()
         media_dir = os.path.join(project_dir, "media")
 
         # Check if RetroPie is installed
@@ -414,6 +457,9 @@ def integrate_with_retropie(gui_apps):
         ports_path = os.path.join(retropie_roms_path, "ports")
         os.makedirs(ports_path, exist_ok=True)
 
+        # List the media directory once instead of stat-ing every icon
+        media_files = list_file_names(media_dir)
+
         # Create a script for each app (except RetroPie itself)
         for app_name, app_config in gui_apps.items():
             if app_name == "retropie":
@@ -423,24 +469,20 @@ def integrate_with_retropie(gui_apps):
 
             # Create the script directly in the ports directory
             script_path = os.path.join(ports_path, f"Launch {display_name}.sh")
-            script_content = f"""#!/bin/bash
-# Script to launch {display_name} from RetroPie
-python3 ${{DYS_RPI}}/scripts/app_switch.py {app_name}
-"""
+            script_content = PORT_SCRIPT_TEMPLATE.format(display_name=display_name, app_name=app_name)
 
             try:
-                with open(script_path, "w") as f:
-                    f.write(script_content)
+                write_file_atomic(script_path, script_content.encode())
 
                 # Make the script executable
                 os.chmod(script_path, 0o755)
 
                 # Set the correct ownership
-                subprocess.run(["chown", f"{user}:{user}", script_path], check=True)
+                chown_to_user(script_path, user)
 
                 # Copy the icon from the project media directory to RetroPie's images directory
                 icon_path = os.path.join(media_dir, f"{app_name}.png")
-                if os.path.exists(icon_path):
+                if f"{app_name}.png" in media_files:
                     # RetroPie looks for images in several locations, we'll use the ports images directory
                     retropie_images_dir = os.path.join("/opt/retropie/configs/all/emulationstation/downloaded_images/ports")
                     os.makedirs(retropie_images_dir, exist_ok=True)
@@ -450,7 +492,7 @@ python3 ${{DYS_RPI}}/scripts/app_switch.py {app_name}
                     shutil.copy2(icon_path, icon_dest)
 
                     # Set the correct ownership
-                    subprocess.run(["chown", f"{user}:{user}", icon_dest], check=True)
+                    chown_to_user(icon_dest, user)
 
                     log.info(f"Added custom icon for {display_name} in RetroPie (from project media)")
                 else:
@@ -487,11 +529,8 @@ fi
         try:
             # Check if .bashrc exists
             if os.path.exists(bashrc_path):
-                with open(bashrc_path, "r") as f:
-                    content = f.read()
-
                 # Check if app_switch is already in .bashrc
-                if "app_switch.py" in content:
+                if file_contains(bashrc_path, b"app_switch.py"):
                     log.info(f"App switching already configured in {bashrc_path}")
                     return True
                 else:
@@ -506,7 +545,7 @@ fi
                 log.info(f"✅ Created {bashrc_path} with autostart")
 
             # Set proper ownership
-            subprocess.run(["chown", f"{user}:{user}", bashrc_path], check=True)
+            chown_to_user(bashrc_path, user)
 
             log.info(f"{boot_app} will now start on boot")
             return True
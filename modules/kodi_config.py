@@ -8,7 +8,7 @@ import os
 import subprocess
 import pwd
 import config
-from utils.xml_utils import insert_xml_if_missing
+from utils.xml_utils import insert_xml_if_missing, insert_xml_blocks_if_missing
 from utils.apt_utils import check_package_installed
 from utils.logger import logger_instance as log
 from utils.command_utils import run_command
@@ -79,6 +79,8 @@ def configure_kodi_sources():
     </games>
 </sources>""")
 
+    # Insert all repositories with a single read and write of sources.xml
+    items = []
     for repo in config.KODI_REPOSITORIES:
         name = repo.get("name")
         url = repo.get("url")
@@ -86,7 +88,8 @@ def configure_kodi_sources():
         allowsharing = repo.get("allowsharing", True)
 
         xml_block = generate_kodi_source_block(name, url, pathversion, allowsharing)
-        insert_xml_if_missing(xml_file, target_section, xml_block)
+        items.append((target_section, xml_block))
+    insert_xml_blocks_if_missing(xml_file, items)
 
 
 def ensure_kodi_directories():
@@ -150,7 +153,7 @@ def launch_and_kill_kodi():
         return True
     except Exception as e:
         log.error("❌ Failed to launch and kill Kodi.")
-        log.debug(f"Error: {e}")
+        log.debug("Error: %s", e)
         return False
 
 
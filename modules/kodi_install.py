@@ -1,7 +1,7 @@
 ﻿import os
 import subprocess
 import config
-from utils.xml_utils import insert_xml_if_missing
+from utils.xml_utils import insert_xml_blocks_if_missing
 from utils.apt_utils import handle_package_install, check_package_installed
 from utils.logger import logger_instance as log
 from utils.interaction import ask_user_choice
@@ -68,6 +68,8 @@ def configure_kodi_sources():
     </games>
 </sources>""")
 
+    # Insert all repositories with a single read and write of sources.xml
+    items = []
     for repo in config.KODI_REPOSITORIES:
         name = repo.get("name")
         url = repo.get("url")
@@ -75,7 +77,8 @@ def configure_kodi_sources():
         allowsharing = repo.get("allowsharing", True)
 
         xml_block = generate_kodi_source_block(name, url, pathversion, allowsharing)
-        insert_xml_if_missing(xml_file, target_section, xml_block)
+        items.append((target_section, xml_block))
+    insert_xml_blocks_if_missing(xml_file, items)
 
 
 def is_kodi_installed():
@@ -145,7 +148,7 @@ def launch_and_kill_kodi():
         log.info(f"✅ Kodi launched and killed successfully (exit code: {return_code})")
     except Exception as e:
         log.error("❌ Failed to launch and kill Kodi.")
-        log.debug(f"Error: {e}")
+        log.debug("Error: %s", e)
 
 def main_install():
 
@@ -164,7 +167,8 @@ def main_install():
 
     log.info("\n📦 Installing Kodi...")
     log.tail_note()
-    success = handle_package_install(PACKAGE_NAME, config.AUTO_UPDATE_PACKAGES)
+    # The user may have just asked to update an installed Kodi, so don't skip it
+    success = handle_package_install(PACKAGE_NAME, config.AUTO_UPDATE_PACKAGES, skip_installed=False)
 
     if not success:
         log.error("❌ Failed to install Kodi.")
@@ -8,7 +8,7 @@ import sys
 import config
 from utils.logger import logger_instance as log
 from utils.os_utils import run_command
-from utils.apt_utils import handle_package_install, check_package_installed
+from utils.apt_utils import handle_package_install, handle_packages_install, check_package_installed
 from utils.error_handler import handle_error, try_operation
 from utils.exceptions import InstallationError, ConfigurationError
 
@@ -56,11 +56,10 @@ def install_prerequisites():
     with log.log_section("Installing Prerequisites"):
         log.info(f"📦 Installing dependencies for {PACKAGE_NAME}...")
         
-        for dep in REQUIRED_DEPS:
-            with try_operation(f"Installing {dep}"):
-                success = handle_package_install(dep, auto_update_packages=True)
-                if not success:
-                    raise InstallationError(f"Failed to install dependency: {dep}")
+        with try_operation(f"Installing {', '.join(REQUIRED_DEPS)}"):
+            success = handle_packages_install(REQUIRED_DEPS, auto_update_packages=True)
+            if not success:
+                raise InstallationError(f"Failed to install dependencies: {', '.join(REQUIRED_DEPS)}")
         
         log.info("✅ All dependencies installed successfully.")
         return True
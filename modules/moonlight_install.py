@@ -1,4 +1,4 @@
-﻿from utils.apt_utils import handle_package_install, check_package_installed
+﻿from utils.apt_utils import handle_package_install, handle_packages_install, check_package_installed, clear_version_cache
 from utils.logger import logger_instance as log
 from utils.interaction import ask_user_choice
 from utils.os_utils import run_command
@@ -31,8 +31,7 @@ def install_moonlight(log, run_as_user="root"):
     Installs Moonlight and its dependencies.
     """
     log.info("\n➡️  Installing dependencies for Moonlight...")
-    for dep in REQUIRED_DEPS:
-        handle_package_install(dep, auto_update_packages=True,  run_as_user=run_as_user)
+    handle_packages_install(REQUIRED_DEPS, auto_update_packages=True, run_as_user=run_as_user)
 
     log.info("\n➡️  Setting up Moonlight repository...")
     try:
@@ -48,6 +47,9 @@ def install_moonlight(log, run_as_user="root"):
         log.error(f"❌ Failed to set up Moonlight repository: {e}")
         return False
 
+    # The repository setup refreshed the package lists
+    clear_version_cache()
+
     log.info("\n➡️  Installing Moonlight...")
     log.tail_note()
     return handle_package_install(PACKAGE_NAME, auto_update_packages=True,  run_as_user=run_as_user)
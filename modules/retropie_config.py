@@ -96,8 +96,11 @@ def copy_gamepad_configs():
     # Path to the destination directory
     retropie_joypads_dir = "/opt/retropie/configs/all/retroarch-joypads"
 
-    # Check if source directory exists
-    if not os.path.exists(gamepads_cfg_dir):
+    # List the source configs in one pass; a missing directory raises here
+    try:
+        with os.scandir(gamepads_cfg_dir) as entries:
+            cfg_files = [entry.name for entry in entries if entry.name.endswith(".cfg")]
+    except FileNotFoundError:
         log.warning(f"⚠️ Gamepad configs directory not found at {gamepads_cfg_dir}")
         return False
 
@@ -113,25 +116,24 @@ def copy_gamepad_configs():
 
     # Copy each config file
     copied_count = 0
-    for filename in os.listdir(gamepads_cfg_dir):
-        if filename.endswith(".cfg"):
-            source_file = os.path.join(gamepads_cfg_dir, filename)
-            dest_file = os.path.join(retropie_joypads_dir, filename)
+    for filename in cfg_files:
+        source_file = os.path.join(gamepads_cfg_dir, filename)
+        dest_file = os.path.join(retropie_joypads_dir, filename)
 
-            try:
-                # Copy the file
-                shutil.copy2(source_file, dest_file)
+        try:
+            # Copy the file
+            shutil.copy2(source_file, dest_file)
 
-                # Set proper ownership
-                run_command(["chown", f"{user}:{user}", dest_file])
+            # Set proper ownership
+            run_command(["chown", f"{user}:{user}", dest_file])
 
-                # Set proper permissions
-                run_command(["chmod", "644", dest_file])
+            # Set proper permissions
+            run_command(["chmod", "644", dest_file])
 
-                log.info(f"  ✅ Copied {filename} to {retropie_joypads_dir}")
-                copied_count += 1
-            except Exception as e:
-                log.error(f"  ❌ Failed to copy {filename}: {e}")
+            log.info(f"  ✅ Copied {filename} to {retropie_joypads_dir}")
+            copied_count += 1
+        except Exception as e:
+            log.error(f"  ❌ Failed to copy {filename}: {e}")
 
     if copied_count > 0:
         log.info(f"✅ Successfully copied {copied_count} gamepad configuration files")
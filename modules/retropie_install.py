@@ -2,7 +2,7 @@
 import shutil
 import hashlib
 import re
-from utils.apt_utils import handle_package_install
+from utils.apt_utils import handle_package_install, handle_packages_install
 from utils.logger import logger_instance as log
 import config
 from utils.os_utils import get_home_directory, run_command
@@ -13,8 +13,7 @@ RETROPIE_CLONE_DIR = os.path.join(HOME_DIR, "RetroPie-Setup")
 
 def install_prerequisites():
     log.info("🔧 Installing prerequisites...")
-    for pkg in ["git", "lsb-release"]:
-        handle_package_install(pkg, auto_update_packages=True)
+    handle_packages_install(["git", "lsb-release"], auto_update_packages=True)
 
 
 def clone_retropie():
@@ -330,8 +329,11 @@ def copy_gamepad_configs():
     # Path to the destination directory
     retropie_joypads_dir = "/opt/retropie/configs/all/retroarch-joypads"
 
-    # Check if source directory exists
-    if not os.path.exists(gamepads_cfg_dir):
+    # List the source configs in one pass; a missing directory raises here
+    try:
+        with os.scandir(gamepads_cfg_dir) as entries:
+            cfg_files = [entry.name for entry in entries if entry.name.endswith(".cfg")]
+    except FileNotFoundError:
         log.warning(f"⚠️ Gamepad configs directory not found at {gamepads_cfg_dir}")
         return False
 
@@ -347,25 +349,24 @@ def copy_gamepad_configs():
 
     # Copy each config file
     copied_count = 0
-    for filename in os.listdir(gamepads_cfg_dir):
-        if filename.endswith(".cfg"):
-            source_file = os.path.join(gamepads_cfg_dir, filename)
-            dest_file = os.path.join(retropie_joypads_dir, filename)
+    for filename in cfg_files:
+        source_file = os.path.join(gamepads_cfg_dir, filename)
+        dest_file = os.path.join(retropie_joypads_dir, filename)
 
-            try:
-                # Copy the file
-                shutil.copy2(source_file, dest_file)
+        try:
+            # Copy the file
+            shutil.copy2(source_file, dest_file)
 
-                # Set proper ownership
-                run_command(["chown", f"{user}:{user}", dest_file])
+            # Set proper ownership
+            run_command(["chown", f"{user}:{user}", dest_file])
 
-                # Set proper permissions
-                run_command(["chmod", "644", dest_file])
+            # Set proper permissions
+            run_command(["chmod", "644", dest_file])
 
-                log.info(f"  ✅ Copied {filename} to {retropie_joypads_dir}")
-                copied_count += 1
-            except Exception as e:
-                log.error(f"  ❌ Failed to copy {filename}: {e}")
+            log.info(f"  ✅ Copied {filename} to {retropie_joypads_dir}")
+            copied_count += 1
+        except Exception as e:
+            log.error(f"  ❌ Failed to copy {filename}: {e}")
 
     if copied_count > 0:
         log.info(f"✅ Successfully copied {copied_count} gamepad configuration files")
@@ -5,11 +5,14 @@ This module handles all system-level configuration tasks.
 """
 
 import os
+import re
 import config
 import subprocess
 from datetime import datetime
 from utils.logger import logger_instance as log
 
+# The DYS_RPI assignment in /etc/environment, capturing its value
+DYS_RPI_LINE_RE = re.compile(r"^DYS_RPI=(.*)$", re.M)
 
 def apply_locale_settings():
     """
@@ -152,19 +155,15 @@ def setup_project_environment_variable(custom_path=None):
         log.info(f"✅ Environment variable {env_var_name} already set to {project_dir}")
         return True
 
-    # Remove any existing setting for this variable
-    new_lines = []
-    for line in current_content.splitlines():
-        if not line.startswith(f"{env_var_name}="):
-            new_lines.append(line)
-
-    # Add the new environment variable
-    new_lines.append(env_line)
+    # Remove any existing setting for this variable in a single pass
+    new_content = re.sub(rf"^{env_var_name}=.*(?:\n|$)", "", current_content, flags=re.M)
+    if new_content and not new_content.endswith("\n"):
+        new_content += "\n"
 
-    # Write back to /etc/environment
+    # Write back to /etc/environment with the new environment variable
     try:
         with open(env_file_path, "w") as f:
-            f.write("\n".join(new_lines) + "\n")
+            f.write(new_content + env_line + "\n")
         log.info(f"✅ Set {env_var_name} to {project_dir}")
         log.info("⚠️ A system reboot is required for the environment variable to take effect")
         return True
@@ -237,10 +236,9 @@ def update_environment_variable_menu():
     current_value = None
     try:
         with open("/etc/environment", "r") as f:
-            for line in f:
-                if line.startswith("DYS_RPI="):
-                    current_value = line.strip().split('=', 1)[1].strip('"')
-                    break
+            match = DYS_RPI_LINE_RE.search(f.read())
+        if match:
+            current_value = match.group(1).strip().strip('"')
     except Exception:
         pass
 
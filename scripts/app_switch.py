@@ -9,6 +9,7 @@ import subprocess
 import argparse
 import getpass
 import time
+from concurrent.futures import ThreadPoolExecutor
 
 # Simple print function for logging
 def log_info(message):
@@ -31,6 +32,17 @@ SERVICE_MANAGER_SCRIPT = os.path.join(SCRIPT_DIR, "service_manager.sh")
 # Default user (current user)
 DEFAULT_USER = getpass.getuser()
 
+# Services that must be killed/started with sudo; all others run as DEFAULT_USER
+SERVICE_USERS = {
+    "desktop": "root"
+}
+
+# User running this script, looked up once
+_CURRENT_USER = os.environ.get("USER") or DEFAULT_USER
+
+# sudo prefixes by target user; root runs plain sudo without -u
+_SUDO_PREFIXES = {"root": ("sudo",)}
+
 # Map of app names to service names
 APP_TO_SERVICE = {
     "kodi": "kodi",
@@ -39,39 +51,41 @@ APP_TO_SERVICE = {
     "desktop": "desktop"
 }
 
-def run_as_user(command, user=None):
+def _sudo_prefix(user):
+    """Return the (cached) sudo prefix used to run a command as the given user"""
+    prefix = _SUDO_PREFIXES.get(user)
+    if prefix is None:
+        prefix = _SUDO_PREFIXES[user] = ("sudo", "-u", user)
+    return prefix
+
+def run_as_user(command, user=None, quiet=False):
     """
     Run a command as a specific user
 
     Args:
         command: The command to run (list or string)
         user: The user to run as (None for current user, 'root' for sudo without user)
+        quiet: If True, discard the command's output (only the return code matters)
 
     Returns:
         subprocess.CompletedProcess: The result of the command
     """
-    if user is None or user == os.getenv("USER"):
+    if user is None or user == _CURRENT_USER:
         # Run as current user
-        if isinstance(command, list):
-            return subprocess.run(command)
-        else:
-            return subprocess.run(command, shell=True)
-    elif user == "root":
-        # Run with sudo (as root) without specifying a user
-        if isinstance(command, list):
-            sudo_cmd = ["sudo"] + command
-            return subprocess.run(sudo_cmd)
-        else:
-            sudo_cmd = f"sudo {command}"
-            return subprocess.run(sudo_cmd, shell=True)
+        prefix = ()
     else:
-        # Run as different user using sudo -u
-        if isinstance(command, list):
-            sudo_cmd = ["sudo", "-u", user] + command
-            return subprocess.run(sudo_cmd)
-        else:
-            sudo_cmd = f"sudo -u {user} {command}"
-            return subprocess.run(sudo_cmd, shell=True)
+        # Run with sudo, as root or as a different user
+        prefix = _sudo_prefix(user)
+
+    output = {"stdout": subprocess.DEVNULL, "stderr": subprocess.DEVNULL} if quiet else {}
+
+    if isinstance(command, list):
+        return subprocess.run([*prefix, *command], **output)
+    return subprocess.run(" ".join((*prefix, command)), shell=True, **output)
+
+def service_user(service):
+    """Return the user that service_manager.sh should run as for a service"""
+    return SERVICE_USERS.get(service, DEFAULT_USER)
 
 def kill_service(service):
     """
@@ -85,16 +99,8 @@ def kill_service(service):
     """
     log_info(f"Killing {service}...")
 
-    # Determine which user should run the kill command
-    if service == "desktop":
-        # Desktop needs to be killed with sudo
-        user = "root"
-    else:
-        # Other services can be killed as the normal user
-        user = DEFAULT_USER
-
     try:
-        result = run_as_user([SERVICE_MANAGER_SCRIPT, "kill", service], user)
+        result = run_as_user([SERVICE_MANAGER_SCRIPT, "kill", service], service_user(service), quiet=True)
         if result.returncode == 0:
             log_info(f"Successfully killed {service}")
             return True
@@ -117,16 +123,8 @@ def start_service(service):
     """
     log_info(f"Starting {service}...")
 
-    # Determine which user should run the start command
-    if service == "desktop":
-        # Desktop needs to be started with sudo
-        user = "root"
-    else:
-        # Other services can be started as the normal user
-        user = DEFAULT_USER
-
     try:
-        result = run_as_user([SERVICE_MANAGER_SCRIPT, "start", service], user)
+        result = run_as_user([SERVICE_MANAGER_SCRIPT, "start", service], service_user(service), quiet=True)
         if result.returncode == 0:
             log_info(f"Successfully started {service}")
             return True
@@ -184,9 +182,9 @@ def switch_to_app(app):
         time.sleep(1)
         log_info("Child process continuing after fork...")
 
-    # Kill other services
-    for other_service in to_kill:
-        kill_service(other_service)
+    # Kill other services concurrently; each one waits on its own service_manager.sh call
+    with ThreadPoolExecutor(max_workers=len(to_kill)) as executor:
+        list(executor.map(kill_service, to_kill))
 
     # Start the requested service
     return start_service(service)
@@ -235,8 +233,9 @@ def main():
         log_error(f"Service manager script not found at {SERVICE_MANAGER_SCRIPT}")
         return 1
 
-    # Make sure the script is executable
-    os.chmod(SERVICE_MANAGER_SCRIPT, 0o755)
+    # Make sure the script is executable (skip the metadata write if it already is)
+    if not os.access(SERVICE_MANAGER_SCRIPT, os.X_OK):
+        os.chmod(SERVICE_MANAGER_SCRIPT, 0o755)
 
     # Process commands
     if args.command == "kill":
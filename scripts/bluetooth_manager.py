@@ -10,35 +10,91 @@ import os
 import sys
 import re
 import signal
-import select
-
-# Add parent directory to path to import config
-sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+import selectors
+import functools
+
+# Put the project directory first on the path so config resolves without
+# probing every stdlib and site-packages directory before it
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_DIR not in sys.path:
+    sys.path.insert(0, PROJECT_DIR)
 import config
 
+# Timeout in seconds for one-shot bluetoothctl queries
+BLUETOOTHCTL_TIMEOUT = 3
+
 # Global variable to track newly found devices
 newly_found_devices = set()
 
+# Reverse lookup of uppercased MAC addresses to gamepad names from config
+_GAMEPADS_BY_MAC = {mac.upper(): name for name, mac in config.GAMEPADS.items()}
+
+# Character positions of the ':' separators in a MAC address (AA:BB:CC:DD:EE:FF)
+_MAC_SEPARATORS = (2, 5, 8, 11, 14)
+_HEX_DIGITS = frozenset("0123456789abcdefABCDEF")
+
+# Status fields reported by `bluetoothctl info`; unanchored, as interactive
+# session lines can carry a prompt prefix
+_STATUS_RE = re.compile(r"\b(Paired|Trusted|Connected): (yes|no)")
+# Terminal escape sequences; bluetoothctl colours its [NEW]/[CHG]/[DEL] tags and prompt
+_ANSI_RE = re.compile(r"\x1b\[[0-9;]*[A-Za-z]")
+# Asynchronous event tags that can interleave with command output
+_EVENT_TAG_RE = re.compile(r"\[(NEW|CHG|DEL)\]")
+# Device lines from a scan, optionally tagged ([NEW], [CHG], [DEL])
+_SCAN_RE = re.compile(r"(?:\[(NEW|CHG|DEL)\].*?)?Device ([\w:]+) (.+)")
+_TRUSTED_EVENT_RE = re.compile(r"trust succeeded|Trusted: yes")
+_CONNECTED_EVENT_RE = re.compile(r"Connected: yes")
+
+
+def _is_mac(token):
+    """Check whether a token is a colon-separated MAC address"""
+    if len(token) != 17:
+        return False
+    for i, c in enumerate(token):
+        if i in _MAC_SEPARATORS:
+            if c != ":":
+                return False
+        elif c not in _HEX_DIGITS:
+            return False
+    return True
+
+
+def _decode_line(raw_line):
+    """Decode a bluetoothctl output line with its terminal escape sequences removed"""
+    line = raw_line.decode(errors="replace")
+    if "\x1b" in line:
+        line = _ANSI_RE.sub("", line)
+    return line
+
+
+@functools.lru_cache(maxsize=128)
+def _escaped_pattern(text):
+    """Compile a literal string into a regex pattern, caching the result"""
+    return re.compile(re.escape(text))
+
 
 class BluetoothctlProcess:
     """Interactive bluetoothctl process wrapper with timeout control"""
 
-    def __init__(self, timeout=30):
+    def __init__(self, timeout=30, verbose=False):
         self.process = None
         self.timeout = timeout
-        self.output_buffer = ""
+        self.verbose = verbose  # Echo raw bluetoothctl output lines
+        self.output_buffer = bytearray()
 
     def __enter__(self):
         """Start bluetoothctl process when entering context"""
+        # Unbuffered binary pipes: output is read straight from the fd and only
+        # the lines we actually care about get decoded
         self.process = subprocess.Popen(
             ["bluetoothctl"],
             stdin=subprocess.PIPE,
             stdout=subprocess.PIPE,
             stderr=subprocess.STDOUT,
-            text=True,
-            bufsize=1,
-            universal_newlines=True
+            bufsize=0
         )
+        self._selector = selectors.DefaultSelector()
+        self._selector.register(self.process.stdout, selectors.EVENT_READ)
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
@@ -50,6 +106,37 @@ class BluetoothctlProcess:
                 self.process.wait(timeout=2)
             except:
                 self.process.kill()
+            finally:
+                self._selector.close()
+
+    def read_lines(self, wait=0.1):
+        """
+        Read whatever output bluetoothctl produced within the wait time
+
+        Args:
+            wait: Maximum time in seconds to wait for output
+
+        Returns:
+            List of complete output lines as bytes (possibly empty), or None on EOF
+        """
+        if not self._selector.select(timeout=wait):
+            return []
+
+        chunk = os.read(self.process.stdout.fileno(), 4096)
+        if not chunk:  # EOF
+            return None
+
+        self.output_buffer += chunk
+        *lines, rest = self.output_buffer.split(b"\n")
+        self.output_buffer = rest
+        return lines
+
+    def discard_pending(self):
+        """Drop output that has already arrived but was not read yet"""
+        while self._selector.select(timeout=0):
+            if not os.read(self.process.stdout.fileno(), 4096):  # EOF
+                break
+        self.output_buffer.clear()
 
     def send_command(self, command, wait_for=None, timeout=None):
         """
@@ -71,8 +158,7 @@ class BluetoothctlProcess:
             timeout = self.timeout
 
         # Send command
-        self.process.stdin.write(command + "\n")
-        self.process.stdin.flush()
+        self.process.stdin.write(f"{command}\n".encode())
 
         # If no wait condition, return immediately
         if not wait_for:
@@ -80,33 +166,125 @@ class BluetoothctlProcess:
 
         # Prepare regex pattern if wait_for is a string
         if isinstance(wait_for, str):
-            pattern = re.compile(re.escape(wait_for))
+            pattern = _escaped_pattern(wait_for)
         else:
             pattern = wait_for
 
         # Wait for output with timeout
-        output = ""
+        chunks = []
         start_time = time.time()
 
         while time.time() - start_time < timeout:
-            # Check if there's data to read with a small timeout
-            ready, _, _ = select.select([self.process.stdout], [], [], 0.1)
-
-            if ready:
-                line = self.process.stdout.readline()
-                if not line:  # EOF
-                    break
+            lines = self.read_lines()
+            if lines is None:  # EOF
+                break
 
-                output += line
-                print(f"  > {line.strip()}")
+            for raw_line in lines:
+                line = _decode_line(raw_line) + "\n"
+                chunks.append(line)
+                if self.verbose:
+                    print(f"  > {line.strip()}")
 
                 # Check if we got what we're waiting for
                 if pattern.search(line):
-                    return output
+                    return "".join(chunks)
 
         # If we get here, we timed out
         print(f"⚠️ Timeout waiting for: {wait_for}")
-        return output
+        return "".join(chunks)
+
+    def send_commands(self, commands):
+        """
+        Send several commands to bluetoothctl in a single write
+
+        Args:
+            commands: List of commands to send, in order
+        """
+        if not self.process:
+            raise RuntimeError("Process not started")
+
+        self.process.stdin.write(("\n".join(commands) + "\n").encode())
+
+    def info(self, mac, timeout=2):
+        """
+        Query device status through the running bluetoothctl session
+
+        Args:
+            mac: MAC address of the device
+            timeout: Maximum time to wait for the info output
+
+        Returns:
+            Tuple of (paired, trusted, connected)
+        """
+        # Leftovers of earlier commands (e.g. a failed connect) must not be read as the reply
+        self.discard_pending()
+        self.send_command(f"info {mac}")
+
+        flags = {"Paired": False, "Trusted": False, "Connected": False}
+        header = f"Device {mac}".upper()
+        in_block = False
+        start_time = time.time()
+
+        while time.time() - start_time < timeout:
+            lines = self.read_lines()
+            if lines is None:  # EOF
+                break
+
+            for raw_line in lines:
+                line = _decode_line(raw_line)
+
+                # Events for this or other devices are not part of the info block
+                if _EVENT_TAG_RE.search(line):
+                    continue
+
+                # Skip everything before the block for this device starts
+                if not in_block:
+                    if header in line.upper():
+                        if "not available" in line:
+                            return flags["Paired"], flags["Trusted"], flags["Connected"]
+                        in_block = True
+                    continue
+
+                match = _STATUS_RE.search(line)
+                if match:
+                    field, value = match.groups()
+                    flags[field] = value == "yes"
+                    # Connected is the last of the three fields in the info output
+                    if field == "Connected":
+                        return flags["Paired"], flags["Trusted"], flags["Connected"]
+
+        return flags["Paired"], flags["Trusted"], flags["Connected"]
+
+    def wait_for_regex(self, pattern, timeout=None):
+        """
+        Wait until a line of output matches a compiled regex pattern
+
+        Args:
+            pattern: Compiled regex pattern to look for
+            timeout: Custom timeout (uses default if None)
+
+        Returns:
+            True if the pattern was seen before the timeout, False otherwise
+        """
+        if timeout is None:
+            timeout = self.timeout
+
+        start_time = time.time()
+
+        while time.time() - start_time < timeout:
+            lines = self.read_lines()
+            if lines is None:  # EOF
+                break
+
+            for raw_line in lines:
+                line = _decode_line(raw_line)
+                if self.verbose:
+                    print(f"  > {line.strip()}")
+
+                if pattern.search(line):
+                    return True
+
+        return False
 
     def wait_for_pairing_success(self, mac, timeout=None):
         """
@@ -123,14 +301,14 @@ class BluetoothctlProcess:
         ]
 
         while time.time() - start_time < timeout:
-            ready, _, _ = select.select([self.process.stdout], [], [], 0.1)
-
-            if ready:
-                line = self.process.stdout.readline()
-                if not line:  # EOF
-                    break
+            lines = self.read_lines()
+            if lines is None:  # EOF
+                break
 
-                print(f"  > {line.strip()}")
+            for raw_line in lines:
+                line = _decode_line(raw_line)
+                if self.verbose:
+                    print(f"  > {line.strip()}")
 
                 # Check for success patterns
                 for pattern in success_patterns:
@@ -148,19 +326,30 @@ class BluetoothctlProcess:
 def check_device_status(mac):
     """Check if device is paired, trusted, and connected."""
     try:
-        output = subprocess.check_output(["bluetoothctl", "info", mac], text=True)
-        paired = "Paired: yes" in output
-        trusted = "Trusted: yes" in output
-        connected = "Connected: yes" in output
-        return paired, trusted, connected
-    except subprocess.CalledProcessError:
+        result = subprocess.run(
+            ["bluetoothctl", "info", mac],
+            capture_output=True,
+            text=True,
+            timeout=BLUETOOTHCTL_TIMEOUT,
+            check=True
+        )
+        flags = dict(_STATUS_RE.findall(result.stdout))
+        return flags.get("Paired") == "yes", flags.get("Trusted") == "yes", flags.get("Connected") == "yes"
+    except (subprocess.CalledProcessError, subprocess.TimeoutExpired):
         return False, False, False
 
 
 def get_existing_devices():
     """Get list of already known devices before scanning"""
     try:
-        output = subprocess.check_output(["bluetoothctl", "devices"], text=True)
+        result = subprocess.run(
+            ["bluetoothctl", "devices"],
+            capture_output=True,
+            text=True,
+            timeout=BLUETOOTHCTL_TIMEOUT,
+            check=True
+        )
+        output = result.stdout
         devices = {}
         for line in output.splitlines():
             match = re.search(r"Device ([\w:]+) (.+)", line)
@@ -168,13 +357,17 @@ def get_existing_devices():
                 mac, name = match.groups()
                 devices[mac] = name
         return devices
-    except subprocess.CalledProcessError:
+    except (subprocess.CalledProcessError, subprocess.TimeoutExpired):
         return {}
 
 
-def discover_devices(scan_time=20):
+def discover_devices(scan_time=20, settle_time=3, min_scan_time=8, verbose=False):
     """
     Scan for Bluetooth devices with proper timeout handling
+
+    The scan ends early once a previously unknown device has appeared, no further
+    ones have shown up for settle_time seconds and at least min_scan_time seconds
+    have passed; scan_time is the upper bound. verbose echoes raw bluetoothctl output.
     Returns dict of MAC -> Name and a set of newly found devices
     """
     print("🔍 Scanning for Bluetooth devices...")
@@ -195,46 +388,50 @@ def discover_devices(scan_time=20):
     # Track all lines for post-scan analysis
     all_output_lines = []
 
-    with BluetoothctlProcess(timeout=scan_time+5) as bt:
+    with BluetoothctlProcess(timeout=scan_time+5, verbose=verbose) as bt:
         # Turn on scanning
         bt.send_command("power on")
         bt.send_command("scan on")
 
-        # Wait for scan_time seconds
-        print(f"⏳ Scanning for {scan_time} seconds...")
+        # Wait up to scan_time seconds
+        print(f"⏳ Scanning for up to {scan_time} seconds...")
         start_time = time.time()
+        last_new_time = None
 
         while time.time() - start_time < scan_time:
-            ready, _, _ = select.select([bt.process.stdout], [], [], 0.1)
+            now = time.time()
+            if (last_new_time is not None and now - start_time >= min_scan_time
+                    and now - last_new_time >= settle_time):
+                print("⏹️ No more new devices appeared, stopping scan early")
+                break
 
-            if ready:
-                line = bt.process.stdout.readline()
-                if not line:
-                    break
+            lines = bt.read_lines()
+            if lines is None:  # EOF
+                break
 
+            for raw_line in lines:
                 # Save all output for later analysis
-                all_output_lines.append(line)
+                all_output_lines.append(raw_line)
+
+                # Most scan output is property updates; only decode device lines
+                if b"Device " not in raw_line:
+                    continue
+                line = _decode_line(raw_line)
 
                 # Look for device discoveries
-                match = re.search(r"Device ([\w:]+) (.+)", line)
+                match = _SCAN_RE.search(line)
                 if match:
-                    mac, name = match.groups()
+                    tag, mac, name = match.groups()
                     if mac not in existing_devices:
                         new_devices.add(mac)
                     devices[mac] = name
-                    print(f"  📱 Found: {name} ({mac})")
-
-                # Also look for NEW device lines which might not have the Device prefix
-                new_match = re.search(r"\[NEW\].+Device ([\w:]+) (.+)", line)
-                if new_match:
-                    mac, name = new_match.groups()
-                    if mac not in existing_devices:
-                        new_devices.add(mac)
-                    devices[mac] = name
-                    print(f"  🆕 New device: {name} ({mac})")
-
-            # Small sleep to prevent CPU hogging
-            time.sleep(0.01)
+                    # Known devices are announced as [NEW] too when the scan starts;
+                    # only unknown ones may end the scan early
+                    if tag == "NEW" and mac not in existing_devices:
+                        last_new_time = time.time()
+                        print(f"  🆕 New device: {name} ({mac})")
+                    else:
+                        print(f"  📱 Found: {name} ({mac})")
 
         # Turn off scanning
         bt.send_command("scan off")
@@ -242,27 +439,26 @@ def discover_devices(scan_time=20):
     # If no devices found during active scanning, try to extract from the output
     if not devices:
         print("⚠️ No devices found during active scanning, analyzing full output...")
-        for line in all_output_lines:
-            # Look for any MAC address patterns
-            mac_match = re.search(r"((?:[0-9A-F]{2}:){5}[0-9A-F]{2})", line, re.IGNORECASE)
-            if mac_match:
-                mac = mac_match.group(1)
-                name = "Unknown Device"
-                # Try to extract a name if possible
-                name_match = re.search(r"Device.+?(?:[0-9A-F]{2}:){5}[0-9A-F]{2}\s+(.+)", line, re.IGNORECASE)
-                if name_match:
-                    name = name_match.group(1)
-                if mac not in existing_devices:
-                    new_devices.add(mac)
-                devices[mac] = name
-                print(f"  🔍 Extracted: {name} ({mac})")
+        for raw_line in all_output_lines:
+            line = _decode_line(raw_line)
+            # Look for any token that is a MAC address; the rest of the line is the name
+            tokens = line.split()
+            for i, token in enumerate(tokens):
+                if _is_mac(token):
+                    mac = token
+                    name = " ".join(tokens[i + 1:]) or "Unknown Device"
+                    if mac not in existing_devices:
+                        new_devices.add(mac)
+                    devices[mac] = name
+                    print(f"  🔍 Extracted: {name} ({mac})")
+                    break
 
-    # Get final list of devices after scanning
-    final_devices = get_existing_devices()
+    # Devices seen during scanning are already recorded; only query the
+    # final device list if nothing turned up
+    if not devices:
+        final_devices = get_existing_devices()
 
-    # Add any devices found in final check that weren't in our list
-    for mac, name in final_devices.items():
-        if mac not in devices:
+        for mac, name in final_devices.items():
             if mac not in existing_devices:
                 new_devices.add(mac)
             devices[mac] = name
@@ -280,23 +476,19 @@ def discover_devices(scan_time=20):
     return devices
 
 
-def pair_device(mac, timeout=30):
+def pair_device(mac, timeout=30, verbose=False):
     """
     Attempt to pair/trust/connect a device by MAC with proper timeout handling
+    verbose echoes raw bluetoothctl output
     Returns True if successful, False otherwise
     """
     print(f"\n🔗 Pairing with {mac}...")
     print("⏳ This may take some time. Please wait...")
 
-    with BluetoothctlProcess(timeout=timeout) as bt:
-        # Setup agent
-        bt.send_command("power on")
-        bt.send_command("agent on")
-        bt.send_command("default-agent")
-
-        # Start pairing
+    with BluetoothctlProcess(timeout=timeout, verbose=verbose) as bt:
+        # Setup agent and start pairing
         print("📲 Sending pair command...")
-        bt.send_command(f"pair {mac}")
+        bt.send_commands(["power on", "agent on", "default-agent", f"pair {mac}"])
 
         # Wait for pairing to complete
         pairing_success = bt.wait_for_pairing_success(mac, timeout=timeout)
@@ -308,7 +500,7 @@ def pair_device(mac, timeout=30):
         # Trust device
         print("🔒 Trusting device...")
         bt.send_command(f"trust {mac}")
-        time.sleep(2)  # Give it time to process
+        bt.wait_for_regex(_TRUSTED_EVENT_RE, timeout=2)
 
         # Connect to device
         print("🔌 Connecting to device...")
@@ -319,11 +511,12 @@ def pair_device(mac, timeout=30):
 
         if not connection_success:
             print("⚠️ Connection may have failed")
+            # Give the system a moment to report a late connection
+            bt.wait_for_regex(_CONNECTED_EVENT_RE, timeout=3)
 
-    # Verify final status
-    print("🔍 Verifying connection status...")
-    time.sleep(3)  # Give system time to update status
-    paired, trusted, connected = check_device_status(mac)
+        # Verify final status
+        print("🔍 Verifying connection status...")
+        paired, trusted, connected = bt.info(mac)
 
     print(f"\n🔎 Final Status:")
     print(f"   Paired:    {paired}")
@@ -333,13 +526,14 @@ def pair_device(mac, timeout=30):
     return paired and trusted and connected
 
 
-def connect_gamepad(name, timeout=30):
+def connect_gamepad(name, timeout=30, verbose=False):
     """
     Connect a gamepad from config with proper timeout handling
 
     Args:
         name: Name of the gamepad in config.GAMEPADS
         timeout: Timeout in seconds for connection attempts
+        verbose: Echo raw bluetoothctl output
 
     Returns:
         True if successful, False otherwise
@@ -351,32 +545,34 @@ def connect_gamepad(name, timeout=30):
 
     print(f"🎮 Connecting to gamepad '{name}' ({mac})...")
 
-    # Check current status first
-    paired, trusted, connected = check_device_status(mac)
+    # Status check, connect and verification share one bluetoothctl session
+    with BluetoothctlProcess(timeout=timeout, verbose=verbose) as bt:
+        # Check current status first
+        paired, trusted, connected = bt.info(mac)
 
-    if connected:
-        print(f"✅ Gamepad '{name}' is already connected!")
-        return True
+        if connected:
+            print(f"✅ Gamepad '{name}' is already connected!")
+            return True
 
-    if paired and trusted:
-        print(f"ℹ️ Gamepad is paired and trusted, attempting to connect...")
-        with BluetoothctlProcess(timeout=timeout) as bt:
-            bt.send_command("power on")
-            bt.send_command(f"connect {mac}")
+        if paired and trusted:
+            print(f"ℹ️ Gamepad is paired and trusted, attempting to connect...")
+            bt.send_commands(["power on", f"connect {mac}"])
             connection_success = bt.wait_for_pairing_success(mac, timeout=timeout)
+            if not connection_success:
+                # Give the system a moment to report a late connection
+                bt.wait_for_regex(_CONNECTED_EVENT_RE, timeout=2)
 
-        # Verify final status
-        time.sleep(2)
-        _, _, connected = check_device_status(mac)
+            # Verify final status
+            _, _, connected = bt.info(mac)
 
-        if connected:
-            print(f"✅ Successfully connected to {name}.")
-            return True
-        else:
-            print(f"⚠️ Connection failed. Attempting full pairing...")
+            if connected:
+                print(f"✅ Successfully connected to {name}.")
+                return True
+            else:
+                print(f"⚠️ Connection failed. Attempting full pairing...")
 
     # If we get here, we need to do a full pairing
-    return pair_device(mac, timeout=timeout)
+    return pair_device(mac, timeout=timeout, verbose=verbose)
 
 
 def pick_device(devices):
@@ -388,19 +584,17 @@ def pick_device(devices):
         print("❌ No devices found!")
         return None, None
 
-    # Create a reverse lookup of MAC addresses to gamepad names from config
-    config_gamepads_by_mac = {mac.upper(): name for name, mac in config.GAMEPADS.items()}
-
     # Use the global newly_found_devices set
     global newly_found_devices
 
     for i, (mac, name) in enumerate(choices):
         # Check if this MAC address is in our config
-        config_name = config_gamepads_by_mac.get(mac.upper(), "")
+        # (bluetoothctl reports MACs in uppercase, so only normalize on a miss)
+        config_name = _GAMEPADS_BY_MAC.get(mac) or _GAMEPADS_BY_MAC.get(mac.upper(), "")
         config_info = f" [{config_name}]" if config_name else ""
 
         # Check if this is a newly found device
-        new_marker = "➕ " if mac.upper() in newly_found_devices else ""
+        new_marker = "➕ " if mac in newly_found_devices else ""
 
         print(f"{i + 1}. {new_marker}{name} ({mac}){config_info}")
 
@@ -414,9 +608,9 @@ def pick_device(devices):
         return None, None
 
 
-def pair_mode(timeout=45):
+def pair_mode(timeout=45, verbose=False):
     """Run interactive pairing flow with proper timeout handling."""
-    devices = discover_devices()
+    devices = discover_devices(verbose=verbose)
 
     if not devices:
         print("❌ No devices found. Try again.")
@@ -426,17 +620,13 @@ def pair_mode(timeout=45):
     if not mac:
         return False
 
-    success = pair_device(mac, timeout=timeout)
+    success = pair_device(mac, timeout=timeout, verbose=verbose)
 
     if success:
         print(f"✅ Successfully paired and connected to {name} ({mac})!")
 
         # Check if this device is already in config
-        existing_name = None
-        for name, config_mac in config.GAMEPADS.items():
-            if config_mac.upper() == mac.upper():
-                existing_name = name
-                break
+        existing_name = _GAMEPADS_BY_MAC.get(mac) or _GAMEPADS_BY_MAC.get(mac.upper())
 
         if existing_name:
             print(f"\nℹ️ This gamepad is already in your config as '{existing_name}'")
@@ -472,9 +662,12 @@ def list_gamepads():
     print("\nNAME\t\tMAC ADDRESS\t\tSTATUS")
     print("----\t\t-----------\t\t------")
 
-    for name, mac in config.GAMEPADS.items():
-        paired, trusted, connected = check_device_status(mac)
+    # Query all gamepads through a single bluetoothctl session
+    gamepads = list(config.GAMEPADS.items())
+    with BluetoothctlProcess() as bt:
+        statuses = [bt.info(mac) for _, mac in gamepads]
 
+    for (name, mac), (paired, trusted, connected) in zip(gamepads, statuses):
         status = "✅ Connected" if connected else "❌ Disconnected"
         if paired and trusted and not connected:
             status = "⚠️ Paired but not connected"
@@ -591,6 +784,8 @@ def usage():
     print("  python bluetooth_manager.py bconnect <gamepad_name>")
     print("  python bluetooth_manager.py status <gamepad_name>")
     print("  python bluetooth_manager.py list")
+    print("\nOptions:")
+    print("  --verbose    Show raw bluetoothctl output (pair and connect)")
     print("\nCommands:")
     print("  pair         Scan for and pair with a new gamepad")
     print("  connect      Connect to a gamepad using the interactive approach")
@@ -603,6 +798,10 @@ def usage():
 
 
 if __name__ == "__main__":
+    verbose = "--verbose" in sys.argv
+    if verbose:
+        sys.argv.remove("--verbose")
+
     if len(sys.argv) < 2:
         usage()
         sys.exit(1)
@@ -610,14 +809,14 @@ if __name__ == "__main__":
     action = sys.argv[1]
 
     if action == "pair":
-        success = pair_mode()
+        success = pair_mode(verbose=verbose)
         sys.exit(0 if success else 1)
     elif action == "connect" and len(sys.argv) == 3:
         # Get the gamepad name
         name = sys.argv[2]
 
         # Connect to the gamepad
-        success = connect_gamepad(name)
+        success = connect_gamepad(name, verbose=verbose)
         sys.exit(0 if success else 1)
     elif action == "bconnect" and len(sys.argv) == 3:
         # Get the gamepad name
@@ -6,16 +6,38 @@ Helps users set up and pair Moonlight with an NVIDIA GameStream host
 
 import os
 import sys
+import asyncio
 import subprocess
-import time
 import re
 import socket
-import ipaddress
+import select
+import struct
 import shutil
-from getpass import getpass
+from functools import lru_cache
+from pathlib import Path
 
-# Add parent directory to path to import config if needed
-sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+# TCP ports a GameStream/Sunshine host listens on
+GAMESTREAM_TCP_PORTS = (47984, 47989, 48010)
+
+# `moonlight-qt list` output: "<host>: <info>" lines and indented app names
+_HOST_RE = re.compile(r"^([^:\n]*):(.*)$", re.M)
+_APP_RE = re.compile(r"^    (.+)$", re.M)
+
+# Seconds to wait for `moonlight-qt pair` to finish once the PIN is sent
+PAIRING_TIMEOUT = 30
+
+# `moonlight-qt pair` output asking for the PIN
+_PIN_PROMPT_RE = re.compile(rb"\bPIN\b", re.I)
+
+# Parsed output of the last `moonlight-qt list`, see get_paired_hosts()
+_paired_hosts_cache = None
+
+# Written by ensure_documentation_exists() when the setup guide is missing
+DOCUMENTATION_PLACEHOLDER = (
+    "# Moonlight Setup Guide\n\n"
+    "This is a placeholder for the full documentation.\n\n"
+    "Please visit https://github.com/moonlight-stream/moonlight-docs/wiki/Setup-Guide for the complete guide.\n"
+)
 
 # ANSI color codes for terminal output
 class Colors:
@@ -28,40 +50,83 @@ class Colors:
     BOLD = '\033[1m'
     UNDERLINE = '\033[4m'
 
+# Precomputed style prefixes for the print_* helpers
+_HEADER_STYLE = Colors.HEADER + Colors.BOLD
+_STEP_STYLE = Colors.BLUE + Colors.BOLD
+_SUCCESS_PREFIX = Colors.GREEN + Colors.BOLD + "✓ "
+_WARNING_STYLE = Colors.YELLOW + Colors.BOLD
+_WARNING_PREFIX = _WARNING_STYLE + "⚠ "
+_ERROR_PREFIX = Colors.RED + Colors.BOLD + "✗ "
+_HEADER_RULE = _HEADER_STYLE + "=" * 60 + Colors.ENDC
+
+def print_batch(*lines):
+    """Print several lines with a single write to stdout"""
+    sys.stdout.write("\n".join(lines) + "\n")
+    sys.stdout.flush()
+
 def print_header(text):
     """Print a formatted header"""
-    print(f"\n{Colors.HEADER}{Colors.BOLD}{'=' * 60}{Colors.ENDC}")
-    print(f"{Colors.HEADER}{Colors.BOLD}{text.center(60)}{Colors.ENDC}")
-    print(f"{Colors.HEADER}{Colors.BOLD}{'=' * 60}{Colors.ENDC}\n")
+    print_batch(
+        "",
+        _HEADER_RULE,
+        f"{_HEADER_STYLE}{text.center(60)}{Colors.ENDC}",
+        _HEADER_RULE,
+        ""
+    )
 
 def print_step(step_num, text):
     """Print a formatted step"""
-    print(f"{Colors.BLUE}{Colors.BOLD}[Step {step_num}] {text}{Colors.ENDC}")
+    print(f"{_STEP_STYLE}[Step {step_num}] {text}{Colors.ENDC}")
 
 def print_success(text):
     """Print a success message"""
-    print(f"{Colors.GREEN}{Colors.BOLD}✓ {text}{Colors.ENDC}")
+    print(f"{_SUCCESS_PREFIX}{text}{Colors.ENDC}")
 
 def print_warning(text):
     """Print a warning message"""
-    print(f"{Colors.YELLOW}{Colors.BOLD}⚠ {text}{Colors.ENDC}")
+    print(f"{_WARNING_PREFIX}{text}{Colors.ENDC}")
 
 def print_error(text):
     """Print an error message"""
-    print(f"{Colors.RED}{Colors.BOLD}✗ {text}{Colors.ENDC}")
+    print(f"{_ERROR_PREFIX}{text}{Colors.ENDC}")
+
+def confirm(prompt):
+    """Ask a yes/no question; any answer starting with 'y' or 'Y' means yes"""
+    return input(prompt)[:1] in ("y", "Y")
 
-def run_command(command, capture_output=True, shell=False):
-    """Run a command and return the output"""
+async def run_command(command, needs_output=True):
+    """
+    Run a command without blocking the event loop and return the result
+
+    Output is only captured when the caller parses it (needs_output=True);
+    otherwise it is discarded and only the return code is meaningful.
+    """
+    pipe = asyncio.subprocess.PIPE if needs_output else asyncio.subprocess.DEVNULL
+    process = None
     try:
-        if shell:
-            result = subprocess.run(command, shell=True, capture_output=capture_output, text=True)
-        else:
-            result = subprocess.run(command, capture_output=capture_output, text=True)
-        return result
+        process = await asyncio.create_subprocess_exec(*command, stdout=pipe, stderr=pipe)
+        stdout, stderr = await process.communicate()
+    except asyncio.CancelledError:
+        # The caller gave up on the result: stop the child and reap it before unwinding
+        if process is not None and process.returncode is None:
+            try:
+                process.kill()
+            except ProcessLookupError:
+                pass
+            await process.wait()
+        raise
     except Exception as e:
         print_error(f"Error running command: {e}")
         return None
 
+    return subprocess.CompletedProcess(
+        command,
+        process.returncode,
+        stdout.decode(errors="replace") if stdout is not None else None,
+        stderr.decode(errors="replace") if stderr is not None else None
+    )
+
+@lru_cache(maxsize=1)
 def is_raspberry_pi():
     """Check if the script is running on a Raspberry Pi"""
     try:
@@ -76,40 +141,41 @@ def is_raspberry_pi():
         except:
             return False
 
-def check_moonlight_installed():
+@lru_cache(maxsize=1)
+def _moonlight_path():
+    """Locate the moonlight-qt binary in PATH"""
+    return shutil.which("moonlight-qt")
+
+async def check_moonlight_installed():
     """Check if Moonlight is installed and offer to install it if missing"""
     # Check if moonlight-qt is in PATH
-    moonlight_path = shutil.which("moonlight-qt")
+    moonlight_path = _moonlight_path()
     if moonlight_path:
         print_success("Moonlight is installed at: " + moonlight_path)
         return True
 
     print_error("Moonlight is not installed!")
-    install = input(f"{Colors.BOLD}Would you like to install Moonlight now? (y/n): {Colors.ENDC}").lower()
-
-    if install == 'y':
+    if confirm(f"{Colors.BOLD}Would you like to install Moonlight now? (y/n): {Colors.ENDC}"):
         print_step("0", "Installing Moonlight")
         print("This will require sudo privileges...")
 
-        # Update package lists
-        print("Updating package lists...")
-        update_result = run_command(["sudo", "apt", "update"])
-        if update_result.returncode != 0:
-            print_error("Failed to update package lists")
-            print("Please try installing Moonlight manually:")
-            print("  sudo apt update")
-            print("  sudo apt install moonlight-qt")
-            return False
-
-        # Install moonlight-qt
-        print("Installing moonlight-qt...")
-        install_result = run_command(["sudo", "apt", "install", "-y", "moonlight-qt"])
-        if install_result.returncode != 0:
+        # Update package lists and install moonlight-qt in a single sudo/apt run
+        print("Updating package lists and installing moonlight-qt...")
+        install_result = await run_command([
+            "sudo", "sh", "-c",
+            "export DEBIAN_FRONTEND=noninteractive && "
+            "apt-get update && "
+            "apt-get install -y --no-install-recommends moonlight-qt"
+        ], needs_output=False)
+        if install_result is None or install_result.returncode != 0:
             print_error("Failed to install Moonlight")
             print("Please try installing it manually:")
-            print("  sudo apt install moonlight-qt")
+            print("  sudo apt-get update")
+            print("  sudo apt-get install moonlight-qt")
             return False
 
+        # The cached lookup predates the install
+        _moonlight_path.cache_clear()
         print_success("Moonlight installed successfully!")
         return True
     else:
@@ -118,11 +184,13 @@ def check_moonlight_installed():
 
 def validate_ip_address(ip_string):
     """Validate if the string is a valid IP address"""
-    try:
-        ipaddress.ip_address(ip_string)
-        return True
-    except ValueError:
-        return False
+    for family in (socket.AF_INET, socket.AF_INET6):
+        try:
+            socket.inet_pton(family, ip_string)
+            return True
+        except OSError:
+            pass
+    return False
 
 def get_host_ip():
     """Get the IP address of the NVIDIA host from user input"""
@@ -133,13 +201,107 @@ def get_host_ip():
         else:
             print_error("Invalid IP address. Please try again.")
 
-def check_host_reachable(host_ip):
+def _icmp_checksum(data):
+    """Compute the internet checksum of an ICMP packet"""
+    if len(data) % 2:
+        data += b"\0"
+    total = sum(struct.unpack(f"!{len(data) // 2}H", data))
+    total = (total >> 16) + (total & 0xFFFF)
+    total += total >> 16
+    return ~total & 0xFFFF
+
+def icmp_probe(host_ip, timeout=2):
+    """
+    Send a single ICMP echo request from an unprivileged datagram socket
+
+    Returns:
+        bool: True if an echo reply arrived within the timeout
+
+    Raises:
+        OSError: If ICMP sockets are not permitted (see net.ipv4.ping_group_range)
+    """
+    ident = os.getpid() & 0xFFFF
+    header = struct.pack("!BBHHH", 8, 0, 0, ident, 1)
+    payload = b"rpi-dys"
+    checksum = _icmp_checksum(header + payload)
+    packet = struct.pack("!BBHHH", 8, 0, checksum, ident, 1) + payload
+
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM, socket.IPPROTO_ICMP) as sock:
+        sock.sendto(packet, (host_ip, 0))
+        ready, _, _ = select.select([sock], [], [], timeout)
+        if not ready:
+            return False
+        reply = sock.recv(1024)
+        # Type 0 is an echo reply
+        return bool(reply) and reply[0] == 0
+
+async def ping_host(host_ip):
+    """Ping the host and return True if it answered"""
+    try:
+        return await asyncio.to_thread(icmp_probe, host_ip)
+    except OSError:
+        # ICMP sockets not permitted for this user (or not IPv4): use the ping binary
+        result = await run_command(["ping", "-c", "3", "-W", "2", host_ip], needs_output=False)
+        return result is not None and result.returncode == 0
+
+async def check_gamestream_port(host_ip, port=47989, timeout=2):
+    """Check if a GameStream TCP port accepts connections"""
+    try:
+        _, writer = await asyncio.wait_for(asyncio.open_connection(host_ip, port), timeout)
+    except (OSError, asyncio.TimeoutError):
+        return False
+
+    writer.close()
+    try:
+        await writer.wait_closed()
+    except OSError:
+        pass
+    return True
+
+async def probe_gamestream_ports(host_ip, ports=GAMESTREAM_TCP_PORTS, timeout=2):
+    """
+    Probe several GameStream TCP ports concurrently
+
+    Returns:
+        int: The first port found open, or None if none of them are
+    """
+    async def probe(port):
+        return port if await check_gamestream_port(host_ip, port, timeout) else None
+
+    tasks = [asyncio.create_task(probe(port)) for port in ports]
+    try:
+        # Return as soon as any port answers
+        for finished in asyncio.as_completed(tasks):
+            port = await finished
+            if port is not None:
+                return port
+        return None
+    finally:
+        for task in tasks:
+            task.cancel()
+
+async def check_host_reachable(host_ip):
     """Check if the host is reachable"""
     print(f"Checking if host {host_ip} is reachable...")
 
-    # Try to ping the host
-    ping_result = run_command(["ping", "-c", "3", "-W", "2", host_ip])
-    if ping_result.returncode != 0:
+    # Probe the GameStream ports and ping the host at the same time
+    ping_task = asyncio.create_task(ping_host(host_ip))
+    open_port = await probe_gamestream_ports(host_ip)
+
+    if open_port is not None:
+        # An open GameStream port proves the host is up, no need to wait for ping.
+        # Awaiting the cancelled task lets it kill and reap a running ping binary;
+        # the ICMP socket probe in its worker thread ends on its own 2 second timeout
+        ping_task.cancel()
+        try:
+            await ping_task
+        except asyncio.CancelledError:
+            pass
+        return True
+
+    ping_ok = await ping_task
+
+    if not ping_ok:
         print_warning(f"Cannot ping host at {host_ip}")
         print("This could be because:")
         print("  1. Your host PC is not turned on")
@@ -147,57 +309,39 @@ def check_host_reachable(host_ip):
         print("  3. The IP address is incorrect")
         print("  4. ICMP (ping) is blocked by a firewall")
 
-        choice = input(f"\n{Colors.BOLD}Do you want to continue anyway? (y/n): {Colors.ENDC}").lower()
-        if choice == 'y':
+        if confirm(f"\n{Colors.BOLD}Do you want to continue anyway? (y/n): {Colors.ENDC}"):
             print_warning("Continuing without ping verification. Connection might still work if only ICMP is blocked.")
-            # Continue to port check
         else:
             return False
 
-    # Try to check if the GameStream ports are open
-    try:
-        # Check TCP port 47989 (one of the GameStream ports)
-        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        sock.settimeout(2)
-        result = sock.connect_ex((host_ip, 47989))
-        sock.close()
-
-        if result != 0:
-            print_warning(f"GameStream port 47989 is not open on {host_ip}")
-            print("This might indicate that:")
-            print("  1. NVIDIA GameStream is not enabled on the host")
-            print("  2. A firewall is blocking the connection")
-            print("  3. You're using Sunshine instead of GeForce Experience")
-            choice = input("Do you want to continue anyway? (y/n): ").lower()
-            return choice == 'y'
-
-        return True
-    except Exception as e:
-        print_warning(f"Error checking GameStream ports: {e}")
-        choice = input("Do you want to continue anyway? (y/n): ").lower()
-        return choice == 'y'
+    ports = "/".join(str(port) for port in GAMESTREAM_TCP_PORTS)
+    print_warning(f"GameStream ports {ports} are not open on {host_ip}")
+    print("This might indicate that:")
+    print("  1. NVIDIA GameStream is not enabled on the host")
+    print("  2. A firewall is blocking the connection")
+    print("  3. You're using Sunshine instead of GeForce Experience")
+    return confirm("Do you want to continue anyway? (y/n): ")
 
-def list_paired_hosts():
+async def list_paired_hosts():
     """List all paired hosts"""
-    print_step("0", "Checking for existing paired hosts")
-
-    result = run_command(["moonlight-qt", "list"])
-    if result.returncode != 0:
+    result = await run_command(["moonlight-qt", "list"])
+    if result is None or result.returncode != 0:
         print_warning("Failed to list paired hosts")
         return []
 
     # Parse the output to extract host information
-    hosts = []
-    lines = result.stdout.strip().split('\n')
-    for line in lines:
-        if ":" in line and not line.startswith("Usage:"):
-            parts = line.split(':', 1)
-            if len(parts) == 2:
-                host_name = parts[0].strip()
-                host_info = parts[1].strip()
-                hosts.append((host_name, host_info))
-
-    return hosts
+    return [
+        (match.group(1).strip(), match.group(2).strip())
+        for match in _HOST_RE.finditer(result.stdout)
+        if match.group(1) != "Usage"
+    ]
+
+async def get_paired_hosts(force=False):
+    """Return the paired hosts, reusing the last parsed `moonlight-qt list` output"""
+    global _paired_hosts_cache
+    if force or _paired_hosts_cache is None:
+        _paired_hosts_cache = await list_paired_hosts()
+    return _paired_hosts_cache
 
 def is_host_paired(host_ip, hosts):
     """Check if the host is already paired"""
@@ -206,7 +350,35 @@ def is_host_paired(host_ip, hosts):
             return True, host_name
     return False, None
 
-def pair_with_host(host_ip):
+async def wait_for_pin_prompt(process, timeout=10):
+    """
+    Read the pairing process output until it asks for the PIN
+
+    Returns:
+        bool: True if a PIN prompt was seen, False on timeout or EOF
+    """
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    tail = b""
+
+    while True:
+        remaining = deadline - loop.time()
+        if remaining <= 0:
+            return False
+        try:
+            # Chunks rather than lines: the prompt may lack a newline and log lines may be huge
+            chunk = await asyncio.wait_for(process.stdout.read(4096), remaining)
+        except asyncio.TimeoutError:
+            return False
+        if not chunk:  # EOF
+            return False
+        # Keep a few bytes of the previous chunk so a prompt split across reads is still found
+        window = tail + chunk
+        if _PIN_PROMPT_RE.search(window):
+            return True
+        tail = window[-8:]
+
+async def pair_with_host(host_ip):
     """Pair with the host"""
     print_step("3", "Pairing with the host")
     print(f"{Colors.YELLOW}A PIN will be displayed on your host PC.{Colors.ENDC}")
@@ -215,25 +387,34 @@ def pair_with_host(host_ip):
     input(f"{Colors.BOLD}Press Enter to start the pairing process...{Colors.ENDC}")
 
     # Start the pairing process
-    pairing_process = subprocess.Popen(
-        ["moonlight-qt", "pair", host_ip],
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
-        text=True
+    pairing_process = await asyncio.create_subprocess_exec(
+        "moonlight-qt", "pair", host_ip,
+        stdin=asyncio.subprocess.PIPE,
+        stdout=asyncio.subprocess.PIPE,
+        # Merged into stdout so a chatty stderr cannot fill its pipe and stall the child
+        stderr=asyncio.subprocess.STDOUT
     )
 
-    # Wait a moment for the pairing dialog to appear on the host
-    time.sleep(3)
+    # Wait for the pairing process to ask for the PIN (prompt anyway on timeout/EOF)
+    await wait_for_pin_prompt(pairing_process)
 
-    # Ask for the PIN
+    # Ask for the PIN on the loop thread like the other prompts; an input() parked on
+    # an executor thread would keep Ctrl+C from exiting until Enter is pressed
     pin = input(f"{Colors.BOLD}Enter the PIN displayed on your host PC: {Colors.ENDC}")
 
-    # Send the PIN to the process
-    pairing_process.communicate(input=pin)
+    # Send the PIN and drain the remaining output until pairing finishes (bounded)
+    try:
+        await asyncio.wait_for(pairing_process.communicate(pin.encode() + b"\n"), PAIRING_TIMEOUT)
+    except asyncio.TimeoutError:
+        print_warning(f"Pairing did not finish within {PAIRING_TIMEOUT} seconds")
+        pairing_process.kill()
+        await pairing_process.wait()
 
     # Check if pairing was successful
     if pairing_process.returncode == 0:
         print_success("Pairing successful!")
+        # Pairing changed the host list, so refresh the cached copy
+        await get_paired_hosts(force=True)
         return True
     else:
         print_error("Pairing failed!")
@@ -243,12 +424,12 @@ def pair_with_host(host_ip):
         print("  3. NVIDIA GameStream is enabled on your host PC")
         return False
 
-def verify_pairing(host_ip):
+async def verify_pairing(host_ip):
     """Verify that the pairing was successful"""
     print_step("4", "Verifying pairing")
 
     # List hosts again to check if our host is now paired
-    hosts = list_paired_hosts()
+    hosts = await get_paired_hosts()
     paired, host_name = is_host_paired(host_ip, hosts)
 
     if paired:
@@ -258,25 +439,23 @@ def verify_pairing(host_ip):
         print_error(f"Could not verify pairing with {host_ip}")
         return False
 
-def list_apps(host_ip):
+async def list_apps(host_ip):
     """List available apps on the host"""
     print_step("5", "Listing available apps")
 
-    result = run_command(["moonlight-qt", "list", host_ip])
-    if result.returncode != 0:
+    result = await run_command(["moonlight-qt", "list", host_ip])
+    if result is None or result.returncode != 0:
         print_warning("Failed to list apps")
         return False
 
     print_success("Available apps:")
 
     # Parse and display the apps
-    lines = result.stdout.strip().split('\n')
     apps = []
-    for line in lines:
-        if line.startswith("    "):  # Apps are indented in the output
-            app_name = line.strip()
-            apps.append(app_name)
-            print(f"  • {app_name}")
+    for match in _APP_RE.finditer(result.stdout):  # Apps are indented in the output
+        app_name = match.group(1).strip()
+        apps.append(app_name)
+        print(f"  • {app_name}")
 
     if not apps:
         print_warning("No apps found on the host")
@@ -288,61 +467,52 @@ def show_nvidia_host_setup_instructions():
     """Show instructions for setting up the NVIDIA host"""
     print_header("NVIDIA GameStream Host Setup Instructions")
 
-    print("Before continuing, make sure your NVIDIA PC has:")
-    print(f"{Colors.BOLD}1. A supported NVIDIA GPU (GTX/RTX 600+ series){Colors.ENDC}")
-    print(f"{Colors.BOLD}2. GeForce Experience installed and updated{Colors.ENDC}")
-    print(f"{Colors.BOLD}3. GameStream enabled in GeForce Experience{Colors.ENDC}")
-
-    print("\nTo enable GameStream on your PC:")
-    print("  1. Open GeForce Experience")
-    print("  2. Click the Settings (gear) icon in the top-right")
-    print("  3. Click on the SHIELD tab")
-    print("  4. Make sure GameStream is toggled ON")
-
-    print("\nAlternatively, if you're using Sunshine instead of GeForce Experience:")
-    print("  1. Make sure Sunshine is installed and running on your PC")
-    print("  2. Open the Sunshine web interface (usually https://localhost:47990)")
-    print("  3. Make sure your PC's firewall allows Sunshine connections")
+    print_batch(
+        "Before continuing, make sure your NVIDIA PC has:",
+        f"{Colors.BOLD}1. A supported NVIDIA GPU (GTX/RTX 600+ series){Colors.ENDC}",
+        f"{Colors.BOLD}2. GeForce Experience installed and updated{Colors.ENDC}",
+        f"{Colors.BOLD}3. GameStream enabled in GeForce Experience{Colors.ENDC}",
+        "",
+        "To enable GameStream on your PC:",
+        "  1. Open GeForce Experience",
+        "  2. Click the Settings (gear) icon in the top-right",
+        "  3. Click on the SHIELD tab",
+        "  4. Make sure GameStream is toggled ON",
+        "",
+        "Alternatively, if you're using Sunshine instead of GeForce Experience:",
+        "  1. Make sure Sunshine is installed and running on your PC",
+        "  2. Open the Sunshine web interface (usually https://localhost:47990)",
+        "  3. Make sure your PC's firewall allows Sunshine connections"
+    )
 
     input(f"\n{Colors.BOLD}Press Enter when your host PC is ready...{Colors.ENDC}")
 
 def ensure_documentation_exists():
     """Check if the documentation exists and create it if it doesn't"""
-    # Get the directory of this script
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    # Go up one level to the project root
-    project_root = os.path.dirname(script_dir)
-    # Path to the documentation
-    doc_path = os.path.join(project_root, "docs", "MOONLIGHT_SETUP_GUIDE.md")
+    # The documentation lives in docs/ under the project root, one level up from this script
+    doc_path = Path(__file__).resolve().parent.parent / "docs" / "MOONLIGHT_SETUP_GUIDE.md"
 
     # Check if the documentation exists
-    if os.path.exists(doc_path):
+    if doc_path.exists():
         return True
 
     # Create the docs directory if it doesn't exist
-    docs_dir = os.path.dirname(doc_path)
-    if not os.path.exists(docs_dir):
-        try:
-            os.makedirs(docs_dir)
-        except Exception as e:
-            print_warning(f"Could not create docs directory: {e}")
-            return False
+    try:
+        doc_path.parent.mkdir(parents=True, exist_ok=True)
+    except Exception as e:
+        print_warning(f"Could not create docs directory: {e}")
+        return False
 
-    # We would need to create the documentation file here
-    # This would be a large block of markdown text
-    # For brevity, we'll just create a simple placeholder
+    # The full guide ships with the repository; only write a placeholder here
     try:
-        with open(doc_path, "w") as f:
-            f.write("# Moonlight Setup Guide\n\n")
-            f.write("This is a placeholder for the full documentation.\n\n")
-            f.write("Please visit https://github.com/moonlight-stream/moonlight-docs/wiki/Setup-Guide for the complete guide.\n")
+        doc_path.write_text(DOCUMENTATION_PLACEHOLDER)
         print_success(f"Created documentation at {doc_path}")
         return True
     except Exception as e:
         print_warning(f"Could not create documentation: {e}")
         return False
 
-def main():
+async def main_async():
     """Main function"""
     print_header("Moonlight Setup for NVIDIA GameStream")
 
@@ -355,7 +525,7 @@ def main():
         print()
 
     # Check if Moonlight is installed
-    if not check_moonlight_installed():
+    if not await check_moonlight_installed():
         return
 
     # Ensure documentation exists
@@ -364,40 +534,43 @@ def main():
     # Show instructions for setting up the NVIDIA host
     show_nvidia_host_setup_instructions()
 
+    # Look up existing pairings in the background while the host is checked
+    hosts_task = asyncio.create_task(get_paired_hosts())
+
     # Step 1: Get the host IP
     print_step("1", "Enter your NVIDIA PC's IP address")
     host_ip = get_host_ip()
 
     # Step 2: Check if the host is reachable
     print_step("2", "Checking connection to host")
-    if not check_host_reachable(host_ip):
-        choice = input("Do you want to try again with a different IP? (y/n): ").lower()
-        if choice == 'y':
+    if not await check_host_reachable(host_ip):
+        if confirm("Do you want to try again with a different IP? (y/n): "):
             host_ip = get_host_ip()
-            if not check_host_reachable(host_ip):
+            if not await check_host_reachable(host_ip):
                 print_error("Still cannot reach host. Please check your network configuration.")
+                hosts_task.cancel()
                 return
         else:
             print_error("Cannot continue without a reachable host.")
+            hosts_task.cancel()
             return
 
     # Check if already paired
-    hosts = list_paired_hosts()
+    print_step("0", "Checking for existing paired hosts")
+    hosts = await hosts_task
     paired, host_name = is_host_paired(host_ip, hosts)
 
     if paired:
         print_success(f"Already paired with {host_name} ({host_ip})")
-        choice = input("Do you want to pair again? (y/n): ").lower()
-        if choice != 'y':
+        if not confirm("Do you want to pair again? (y/n): "):
             # Skip to listing apps
-            list_apps(host_ip)
+            await list_apps(host_ip)
             return
 
     # Step 3: Pair with the host
-    if not pair_with_host(host_ip):
-        choice = input("Do you want to try pairing again? (y/n): ").lower()
-        if choice == 'y':
-            if not pair_with_host(host_ip):
+    if not await pair_with_host(host_ip):
+        if confirm("Do you want to try pairing again? (y/n): "):
+            if not await pair_with_host(host_ip):
                 print_error("Pairing failed again. Please check your setup and try again later.")
                 return
         else:
@@ -405,32 +578,39 @@ def main():
             return
 
     # Step 4: Verify pairing
-    if not verify_pairing(host_ip):
+    if not await verify_pairing(host_ip):
         print_warning("Could not verify pairing, but we'll continue anyway.")
 
     # Step 5: List available apps
-    list_apps(host_ip)
+    await list_apps(host_ip)
 
     # Final instructions
     print_header("Setup Complete")
-    print("You can now stream games from your PC using Moonlight!")
-    print("\nTo start streaming:")
-    print("  1. Launch Moonlight from the desktop or menu")
-    print("  2. Select your PC from the list")
-    print("  3. Choose a game or app to stream")
-
-    print(f"\n{Colors.BOLD}Useful commands:{Colors.ENDC}")
-    print("  moonlight-qt                  # Launch the Moonlight GUI")
-    print("  moonlight-qt stream HOST APP  # Stream a specific app")
-    print("  moonlight-qt quit HOST        # Quit the current streaming session")
-    print("  moonlight-qt list HOST        # List available apps")
-
-    print(f"\n{Colors.BOLD}Additional Resources:{Colors.ENDC}")
-    print(f"  {Colors.BLUE}docs/MOONLIGHT_SETUP_GUIDE.md{Colors.ENDC}     # Detailed documentation")
-    print(f"  {Colors.BLUE}https://moonlight-stream.org{Colors.ENDC}     # Official Moonlight website")
-    print(f"  {Colors.BLUE}https://moonlight-stream.org/discord{Colors.ENDC} # Discord support server")
-
-    print(f"\n{Colors.YELLOW}{Colors.BOLD}Note: For the best experience, use a wired network connection if possible.{Colors.ENDC}")
+    print_batch(
+        "You can now stream games from your PC using Moonlight!",
+        "",
+        "To start streaming:",
+        "  1. Launch Moonlight from the desktop or menu",
+        "  2. Select your PC from the list",
+        "  3. Choose a game or app to stream",
+        "",
+        f"{Colors.BOLD}Useful commands:{Colors.ENDC}",
+        "  moonlight-qt                  # Launch the Moonlight GUI",
+        "  moonlight-qt stream HOST APP  # Stream a specific app",
+        "  moonlight-qt quit HOST        # Quit the current streaming session",
+        "  moonlight-qt list HOST        # List available apps",
+        "",
+        f"{Colors.BOLD}Additional Resources:{Colors.ENDC}",
+        f"  {Colors.BLUE}docs/MOONLIGHT_SETUP_GUIDE.md{Colors.ENDC}     # Detailed documentation",
+        f"  {Colors.BLUE}https://moonlight-stream.org{Colors.ENDC}     # Official Moonlight website",
+        f"  {Colors.BLUE}https://moonlight-stream.org/discord{Colors.ENDC} # Discord support server",
+        "",
+        f"{_WARNING_STYLE}Note: For the best experience, use a wired network connection if possible.{Colors.ENDC}"
+    )
+
+def main():
+    """Run the setup wizard on an asyncio event loop"""
+    asyncio.run(main_async())
 
 if __name__ == "__main__":
     try:
@@ -12,14 +12,24 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
 
 def run_tests():
-    """Run all tests in the tests directory"""
+    """
+    Run all tests in the tests directory
+
+    Set FAILFAST=1 to stop at the first failure with quieter output while
+    iterating locally; by default every test runs verbosely.
+    """
+    failfast = os.environ.get("FAILFAST") == "1"
+
     # Discover and run tests
     loader = unittest.TestLoader()
     start_dir = os.path.dirname(os.path.abspath(__file__))
     suite = loader.discover(start_dir, pattern="test_*.py")
-    
-    # Run tests with verbosity
-    runner = unittest.TextTestRunner(verbosity=2)
+
+    # Run tests with verbosity, or stop early with captured output in failfast mode
+    if failfast:
+        runner = unittest.TextTestRunner(verbosity=1, failfast=True, buffer=True)
+    else:
+        runner = unittest.TextTestRunner(verbosity=2)
     result = runner.run(suite)
     
     # Return non-zero exit code if tests failed
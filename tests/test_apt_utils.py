@@ -0,0 +1,96 @@
+"""
+Tests for apt_utils module
+"""
+
+import unittest
+from unittest.mock import patch
+import sys
+import os
+import tempfile
+
+# Add parent directory to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from utils import apt_utils
+from utils.apt_utils import (
+    check_package_installed, clear_version_cache, get_available_versions, handle_packages_install
+)
+
+
+DPKG_STATUS = """Package: bash
+Status: install ok installed
+Version: 5.2.15-2
+
+Package: oldpkg
+Status: deinstall ok config-files
+Version: 1.0
+
+Package: libfoo
+Status: deinstall ok config-files
+Architecture: armhf
+
+Package: libfoo
+Status: install ok installed
+Architecture: arm64
+"""
+
+MADISON_OUTPUT = """       git | 1:2.39.5-0+deb12u2 | http://deb.debian.org/debian bookworm/main arm64 Packages
+       git | 1:2.39.2-1.1 | http://deb.debian.org/debian bookworm/main arm64 Packages
+"""
+
+
+class TestAptUtils(unittest.TestCase):
+    """Test cases for apt_utils module"""
+
+    def setUp(self):
+        """Point the dpkg status lookup at a temporary status file and reset caches"""
+        status_file = tempfile.NamedTemporaryFile("w", suffix="-status", delete=False)
+        status_file.write(DPKG_STATUS)
+        status_file.close()
+        self.addCleanup(os.unlink, status_file.name)
+
+        patcher = patch.object(apt_utils, "DPKG_STATUS_PATH", status_file.name)
+        self.addCleanup(patcher.stop)
+        patcher.start()
+        apt_utils._dpkg_status_cache["mtime"] = None
+        clear_version_cache()
+
+    def test_check_package_installed(self):
+        """Test check_package_installed with an installed package"""
+        self.assertTrue(check_package_installed("bash"))
+
+    def test_check_package_installed_config_files_only(self):
+        """Test check_package_installed with a removed package that left config files"""
+        self.assertFalse(check_package_installed("oldpkg"))
+
+    def test_check_package_installed_multiarch(self):
+        """Test check_package_installed when only one architecture is installed"""
+        self.assertTrue(check_package_installed("libfoo"))
+
+    def test_check_package_installed_unknown(self):
+        """Test check_package_installed with a package dpkg has never seen"""
+        self.assertFalse(check_package_installed("nonexistent"))
+
+    @patch('utils.apt_utils.run_command')
+    def test_get_available_versions(self, mock_run_command):
+        """Test get_available_versions parses madison output, latest first"""
+        mock_run_command.return_value = (0, MADISON_OUTPUT)
+        self.assertEqual(get_available_versions("git"), ["1:2.39.5-0+deb12u2", "1:2.39.2-1.1"])
+
+    @patch('utils.apt_utils.run_command')
+    def test_get_available_versions_cached(self, mock_run_command):
+        """Test get_available_versions queries apt-cache once per package"""
+        mock_run_command.return_value = (0, MADISON_OUTPUT)
+        get_available_versions("git")
+        get_available_versions("git")
+        mock_run_command.assert_called_once()
+
+    @patch('utils.apt_utils.run_command')
+    def test_handle_packages_install_skips_installed(self, mock_run_command):
+        """Test handle_packages_install does not touch apt for installed packages"""
+        self.assertTrue(handle_packages_install(["bash", "libfoo"]))
+        mock_run_command.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
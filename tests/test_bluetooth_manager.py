@@ -0,0 +1,110 @@
+"""
+Tests for bluetooth_manager script
+"""
+
+import unittest
+from unittest.mock import patch, MagicMock
+import sys
+import os
+import time
+
+# Add parent and scripts directories to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "scripts")))
+
+import bluetooth_manager
+from bluetooth_manager import BluetoothctlProcess
+
+MAC = "AA:BB:CC:DD:EE:FF"
+
+
+def _colored(tag, color="93"):
+    """Wrap an event tag in colour codes the way bluetoothctl prints it"""
+    return f"[\x1b[0;{color}m{tag}\x1b[0m]"
+
+
+class TestBluetoothctlInfo(unittest.TestCase):
+    """Test cases for BluetoothctlProcess.info"""
+
+    def _session(self, *lines):
+        """Build a session whose output is the given lines, read in one go"""
+        bt = BluetoothctlProcess()
+        bt.send_command = MagicMock()
+        bt.discard_pending = MagicMock()
+        bt.read_lines = MagicMock(side_effect=[[line.encode() for line in lines], None])
+        return bt
+
+    def test_info_block(self):
+        """Test info reads the status fields of the device block"""
+        bt = self._session(
+            f"Device {MAC} (public)",
+            "\tName: Pad",
+            "\tPaired: yes",
+            "\tTrusted: yes",
+            "\tConnected: no",
+        )
+        self.assertEqual(bt.info(MAC), (True, True, False))
+
+    def test_info_prompt_prefixed_fields(self):
+        """Test info accepts status lines that carry a prompt prefix"""
+        bt = self._session(
+            f"[bluetooth]# Device {MAC} (public)",
+            "[bluetooth]# \tPaired: yes",
+            "[Pad]# \tTrusted: yes",
+            "\tConnected: yes",
+        )
+        self.assertEqual(bt.info(MAC.lower()), (True, True, True))
+
+    def test_info_ignores_events_and_other_output(self):
+        """Test info skips [CHG] events and lines before the device header"""
+        bt = self._session(
+            "[CHG] Device 11:22:33:44:55:66 Connected: yes",
+            "\tConnected: yes",
+            f"Device {MAC} (public)",
+            "\tPaired: yes",
+            f"[CHG] Device {MAC} Connected: yes",
+            "\tTrusted: no",
+            "\tConnected: no",
+        )
+        self.assertEqual(bt.info(MAC), (True, False, False))
+
+    def test_info_ignores_colored_events(self):
+        """Test info skips event lines whose tags carry colour codes"""
+        bt = self._session(
+            f"\x1b[0;94m[bluetooth]\x1b[0m# Device {MAC} (public)",
+            "\tPaired: yes",
+            f"{_colored('CHG')} Device {MAC} Connected: yes",
+            "\tTrusted: yes",
+            "\tConnected: no",
+        )
+        self.assertEqual(bt.info(MAC), (True, True, False))
+
+    def test_info_not_available(self):
+        """Test info reports nothing for an unknown device"""
+        bt = self._session(f"Device {MAC} not available")
+        self.assertEqual(bt.info(MAC), (False, False, False))
+
+
+
+class TestDiscoverDevices(unittest.TestCase):
+    """Test cases for discover_devices"""
+
+    @patch('builtins.print')
+    @patch('bluetooth_manager.get_existing_devices', return_value={})
+    @patch('bluetooth_manager.BluetoothctlProcess')
+    def test_colored_new_device_ends_scan_early(self, mock_process, mock_existing, mock_print):
+        """Test a coloured [NEW] line for an unknown device starts the settle timer"""
+        bt = mock_process.return_value.__enter__.return_value
+        output = [[f"{_colored('NEW', '92')} Device {MAC} Pad".encode()]]
+        bt.read_lines.side_effect = lambda: output.pop() if output else []
+
+        start_time = time.time()
+        devices = bluetooth_manager.discover_devices(scan_time=5, settle_time=0, min_scan_time=0)
+
+        self.assertLess(time.time() - start_time, 1)
+        self.assertEqual(devices, {MAC: "Pad"})
+        self.assertEqual(bluetooth_manager.newly_found_devices, {MAC})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -6,17 +6,40 @@ import unittest
 from unittest.mock import patch, MagicMock
 import sys
 import os
+import stat
 import types
 
 # Add parent directory to path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
-from utils.config_validator import validate_config, validate_user_exists, validate_path_exists
+from utils import config_validator
+from utils.config_validator import validate_config, validate_user_exists, validate_path_exists, validate_command_exists
 from utils.exceptions import ValidationError, ConfigurationError
 
 
 class TestConfigValidator(unittest.TestCase):
     """Test cases for config_validator module"""
+
+    def setUp(self):
+        """Patch the filesystem and user lookups shared by the tests"""
+        self.mock_stat = self._start_patch('os.stat')
+        self.mock_makedirs = self._start_patch('os.makedirs')
+        self.mock_getpwnam = self._start_patch('pwd.getpwnam')
+        config_validator._known_users.clear()
+        config_validator._command_paths.clear()
+
+    def _start_patch(self, target):
+        """Start a patcher that is stopped automatically after the test"""
+        patcher = patch(target)
+        self.addCleanup(patcher.stop)
+        return patcher.start()
+
+    def _set_path(self, exists, is_dir=False):
+        """Make os.stat describe a missing path, a file or a directory"""
+        if not exists:
+            self.mock_stat.side_effect = FileNotFoundError()
+        else:
+            self.mock_stat.return_value = MagicMock(st_mode=stat.S_IFDIR if is_dir else stat.S_IFREG)
     
     def test_validate_config_minimal_valid(self):
         """Test validate_config with minimal valid config"""
@@ -55,49 +78,57 @@ class TestConfigValidator(unittest.TestCase):
         with self.assertRaises(ConfigurationError):
             validate_config(mock_config)
     
-    @patch('pwd.getpwnam')
-    def test_validate_user_exists_valid(self, mock_getpwnam):
+    def test_validate_user_exists_valid(self):
         """Test validate_user_exists with valid user"""
-        mock_getpwnam.return_value = MagicMock()
+        self.mock_getpwnam.return_value = MagicMock()
         self.assertTrue(validate_user_exists('testuser'))
     
-    @patch('pwd.getpwnam')
-    def test_validate_user_exists_invalid(self, mock_getpwnam):
+    def test_validate_user_exists_cached(self):
+        """Test validate_user_exists looks up a known user only once"""
+        self.mock_getpwnam.return_value = MagicMock()
+        validate_user_exists('testuser')
+        validate_user_exists('testuser')
+        self.mock_getpwnam.assert_called_once_with('testuser')
+    
+    def test_validate_user_exists_invalid(self):
         """Test validate_user_exists with invalid user"""
-        mock_getpwnam.side_effect = KeyError('User not found')
+        self.mock_getpwnam.side_effect = KeyError('User not found')
         with self.assertRaises(ValidationError):
             validate_user_exists('nonexistentuser')
     
-    @patch('os.path.exists')
-    def test_validate_path_exists_valid(self, mock_exists):
+    def test_validate_path_exists_valid(self):
         """Test validate_path_exists with existing path"""
-        mock_exists.return_value = True
+        self._set_path(exists=True, is_dir=True)
         self.assertTrue(validate_path_exists('/existing/path'))
     
-    @patch('os.path.exists')
-    @patch('os.path.isdir')
-    def test_validate_path_exists_not_dir(self, mock_isdir, mock_exists):
+    def test_validate_path_exists_not_dir(self):
         """Test validate_path_exists with existing file when dir expected"""
-        mock_exists.return_value = True
-        mock_isdir.return_value = False
+        self._set_path(exists=True, is_dir=False)
         with self.assertRaises(ValidationError):
             validate_path_exists('/existing/file', is_dir=True)
     
-    @patch('os.path.exists')
-    @patch('os.makedirs')
-    def test_validate_path_exists_create(self, mock_makedirs, mock_exists):
+    def test_validate_path_exists_create(self):
         """Test validate_path_exists with non-existing path and create=True"""
-        mock_exists.return_value = False
+        self._set_path(exists=False)
         self.assertTrue(validate_path_exists('/nonexistent/path', create=True))
-        mock_makedirs.assert_called_once_with('/nonexistent/path', exist_ok=True)
+        self.mock_makedirs.assert_called_once_with('/nonexistent/path', exist_ok=True)
     
-    @patch('os.path.exists')
-    def test_validate_path_exists_nonexistent(self, mock_exists):
+    def test_validate_path_exists_nonexistent(self):
         """Test validate_path_exists with non-existing path and create=False"""
-        mock_exists.return_value = False
+        self._set_path(exists=False)
         with self.assertRaises(ValidationError):
             validate_path_exists('/nonexistent/path', create=False)
 
+    @patch('shutil.which')
+    def test_validate_command_exists_rechecks_missing(self, mock_which):
+        """Test a missing command is looked up again once it may have been installed"""
+        mock_which.side_effect = [None, '/usr/bin/moonlight-qt']
+        with self.assertRaises(ValidationError):
+            validate_command_exists('moonlight-qt')
+        self.assertTrue(validate_command_exists('moonlight-qt'))
+        self.assertTrue(validate_command_exists('moonlight-qt'))
+        self.assertEqual(mock_which.call_count, 2)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -3,29 +3,66 @@ Tests for os_utils module
 """
 
 import unittest
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch
 import sys
 import os
+import subprocess
 
 # Add parent directory to path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
-from utils.os_utils import get_codename, is_running_as_root, get_raspberry_pi_model
+from utils import os_utils
+from utils.os_utils import get_codename, is_running_as_root, get_raspberry_pi_model, is_command_available
 
 
 class TestOsUtils(unittest.TestCase):
     """Test cases for os_utils module"""
+
+    def setUp(self):
+        """Patch the subprocess and file calls shared by the tests"""
+        self.mock_check_output = self._start_patch('subprocess.check_output')
+        self.mock_run = self._start_patch('subprocess.run')
+        # No os-release file unless a test provides one, so get_codename uses lsb_release
+        self.mock_open = self._start_patch('builtins.open')
+        self.mock_open.side_effect = FileNotFoundError()
+        get_codename.cache_clear()
+        is_running_as_root.cache_clear()
+        get_raspberry_pi_model.cache_clear()
+        os_utils._available_commands.clear()
+
+    def _start_patch(self, target):
+        """Start a patcher that is stopped automatically after the test"""
+        patcher = patch(target)
+        self.addCleanup(patcher.stop)
+        return patcher.start()
     
-    @patch('subprocess.check_output')
-    def test_get_codename_success(self, mock_check_output):
+    def test_get_codename_success(self):
         """Test get_codename when subprocess succeeds"""
-        mock_check_output.return_value = "bookworm\n"
+        self.mock_check_output.return_value = "bookworm\n"
+        self.assertEqual(get_codename(), "bookworm")
+
+    @patch('builtins.open', new_callable=unittest.mock.mock_open,
+           read_data='PRETTY_NAME="Debian GNU/Linux 12 (bookworm)"\nVERSION_CODENAME=bookworm\n')
+    def test_get_codename_from_os_release(self, mock_open):
+        """Test get_codename reads /etc/os-release without running lsb_release"""
         self.assertEqual(get_codename(), "bookworm")
+        self.mock_check_output.assert_not_called()
     
-    @patch('subprocess.check_output')
-    def test_get_codename_failure(self, mock_check_output):
-        """Test get_codename when subprocess fails"""
-        mock_check_output.side_effect = Exception("Command failed")
+    def test_get_codename_cached(self):
+        """Test get_codename only runs lsb_release once"""
+        self.mock_check_output.return_value = "bookworm\n"
+        get_codename()
+        get_codename()
+        self.mock_check_output.assert_called_once()
+    
+    def test_get_codename_failure(self):
+        """Test get_codename when lsb_release fails"""
+        self.mock_check_output.side_effect = subprocess.CalledProcessError(1, ['lsb_release', '-cs'])
+        self.assertEqual(get_codename(), "unknown")
+    
+    def test_get_codename_lsb_release_missing(self):
+        """Test get_codename when lsb_release is not installed"""
+        self.mock_check_output.side_effect = FileNotFoundError("lsb_release")
         self.assertEqual(get_codename(), "unknown")
     
     @patch('os.geteuid')
@@ -34,32 +71,36 @@ class TestOsUtils(unittest.TestCase):
         mock_geteuid.return_value = 0
         self.assertTrue(is_running_as_root())
         
+        is_running_as_root.cache_clear()
         mock_geteuid.return_value = 1000
         self.assertFalse(is_running_as_root())
     
-    @patch('os.path.exists')
-    @patch('builtins.open', new_callable=unittest.mock.mock_open, read_data="Raspberry Pi 5 Model B Rev 1.0\x00\n")
-    def test_get_raspberry_pi_model_from_file(self, mock_open, mock_exists):
+    @patch('shutil.which')
+    def test_is_command_available_rechecks_missing(self, mock_which):
+        """Test a missing command is looked up again, a found one only once"""
+        mock_which.side_effect = [None, "/usr/bin/moonlight-qt"]
+        self.assertFalse(is_command_available("moonlight-qt"))
+        self.assertTrue(is_command_available("moonlight-qt"))
+        self.assertTrue(is_command_available("moonlight-qt"))
+        self.assertEqual(mock_which.call_count, 2)
+    
+    @patch('builtins.open', new_callable=unittest.mock.mock_open, read_data=b"Raspberry Pi 5 Model B Rev 1.0\x00\n")
+    def test_get_raspberry_pi_model_from_file(self, mock_open):
         """Test get_raspberry_pi_model when file exists"""
-        mock_exists.return_value = True
         self.assertEqual(get_raspberry_pi_model(), "Raspberry Pi 5 Model B Rev 1.0")
     
-    @patch('os.path.exists')
-    @patch('subprocess.run')
-    def test_get_raspberry_pi_model_from_subprocess(self, mock_run, mock_exists):
-        """Test get_raspberry_pi_model when file doesn't exist but subprocess works"""
-        mock_exists.return_value = False
-        mock_process = MagicMock()
-        mock_process.stdout = "Raspberry Pi 5 Model B Rev 1.0\x00\n"
-        mock_run.return_value = mock_process
+    @patch('builtins.open')
+    def test_get_raspberry_pi_model_from_fallback_file(self, mock_open):
+        """Test get_raspberry_pi_model when only the sysfs model file exists"""
+        model_file = unittest.mock.mock_open(read_data=b"Raspberry Pi 5 Model B Rev 1.0\x00\n")()
+        mock_open.side_effect = [FileNotFoundError(), model_file]
         self.assertEqual(get_raspberry_pi_model(), "Raspberry Pi 5 Model B Rev 1.0")
+        self.mock_run.assert_not_called()
     
-    @patch('os.path.exists')
-    @patch('subprocess.run')
-    def test_get_raspberry_pi_model_failure(self, mock_run, mock_exists):
-        """Test get_raspberry_pi_model when all methods fail"""
-        mock_exists.return_value = False
-        mock_run.side_effect = Exception("Command failed")
+    @patch('builtins.open')
+    def test_get_raspberry_pi_model_failure(self, mock_open):
+        """Test get_raspberry_pi_model when no model file can be read"""
+        mock_open.side_effect = FileNotFoundError()
         self.assertEqual(get_raspberry_pi_model(), "Unknown")
 
 
@@ -1,12 +1,49 @@
-﻿from utils.interaction import ask_user_choice
+﻿import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from utils.interaction import ask_user_choice
 from utils.os_utils import run_command
 from utils.logger import logger_instance as log
 
+DPKG_STATUS_PATH = "/var/lib/dpkg/status"
+DPKG_INSTALLED = "install ok installed"
+
+# Version column of `apt-cache madison` lines: "<package> | <version> | <source>"
+_MADISON_VERSION_RE = re.compile(r"^[^|\n]*\|\s*([^|\s]+)\s*\|", re.M)
+
+# "Field: value" lines of the dpkg status paragraphs that are needed
+_DPKG_FIELD_RE = re.compile(r"^(Package|Status): (.*)$", re.M)
+
+# Parsed dpkg status database, keyed on the file's modification time
+_dpkg_status_cache = {"mtime": None, "packages": {}}
+
+
+@lru_cache(maxsize=256)
+def _madison_versions(package_name, run_as_user):
+    """Runs apt-cache madison once per (package, user); failures are not cached."""
+    _, output = run_command(
+        ["apt-cache", "madison", package_name],
+        run_as_user=run_as_user,
+    )
+    return tuple(_MADISON_VERSION_RE.findall(output))
+
+
+def clear_version_cache():
+    """
+    Forgets cached apt-cache lookups.
+
+    Call this after the package lists change (apt-get update, new repositories).
+    """
+    _madison_versions.cache_clear()
+
 
 def get_available_versions(package_name, run_as_user="root"):
     """
     Retrieves available versions of a package from apt-cache.
 
+    Results are cached per package and user until clear_version_cache() is called.
+
     Args:
         package_name (str): The name of the package to query.
         run_as_user (str): User context to run command under (default is root).
@@ -15,114 +52,225 @@ def get_available_versions(package_name, run_as_user="root"):
         list: A list of version strings (latest first). Empty if not found.
     """
     try:
-        _, output = run_command(
-            ["apt-cache", "madison", package_name],
-            run_as_user=run_as_user,
-        )
-        versions = [line.split("|")[1].strip() for line in output.strip().split("\n") if "|" in line]
-        return versions
+        return list(_madison_versions(package_name, run_as_user))
     except Exception as e:
         log.error(f"❌ Failed to fetch available versions for: {package_name}")
-        log.debug(f"Exception details: {e}")
+        log.debug("Exception details: %s", e)
         return []
 
 
+def get_available_versions_bulk(package_names, run_as_user="root", max_workers=8):
+    """
+    Retrieves available versions of several packages with concurrent apt-cache calls.
 
-def install_package(package_name, version=None, run_as_user="root"):
+    Args:
+        package_names (list): Names of the packages to query.
+        run_as_user (str): User context to run commands under (default is root).
+        max_workers (int): Upper bound on concurrent apt-cache processes.
+
+    Returns:
+        dict: Package name -> list of version strings (latest first).
     """
-    Installs a package using apt-get, with optional versioning.
+    if not package_names:
+        return {}
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(package_names))) as executor:
+        results = executor.map(lambda name: get_available_versions(name, run_as_user=run_as_user), package_names)
+        return dict(zip(package_names, results))
+
+
+def install_packages(packages, run_as_user="root"):
+    """
+    Installs several packages with a single apt-get call, with optional versioning.
 
     Args:
-        package_name (str): The package name to install.
-        version (str, optional): Specific version to install.
-        log (Logger, optional): Logger instance for output.
+        packages (list): (package_name, version) pairs; version may be None.
         run_as_user (str): User context to run command under.
 
     Returns:
         bool: True if installation succeeded, False otherwise.
     """
-    command = (
-        ["apt-get", "install", f"{package_name}={version}", "-y"]
-        if version else
-        ["apt-get", "install", package_name, "-y"]
-    )
-
+    specs = [f"{package_name}={version}" if version else package_name for package_name, version in packages]
+    command = ["apt-get", "install"] + specs + ["-y"]
 
-    log.info(f"🛠️ Installing package: {package_name}" + (f" (version {version})" if version else ""))
-    log.debug(f"Running command: {' '.join(command)}")
+    for package_name, version in packages:
+        log.info(f"🛠️ Installing package: {package_name}" + (f" (version {version})" if version else ""))
 
     try:
+        # apt output can be long and is only needed in the log
         run_command(
             command,
             run_as_user=run_as_user,
+            keep_output=False,
         )
         return True
     except Exception as e:
-        log.error(f"❌ Installation of {package_name} failed.")
-        log.debug(f"[APT ERROR] {e}")
+        log.error(f"❌ Installation of {', '.join(name for name, _ in packages)} failed.")
+        log.debug("[APT ERROR] %s", e)
 
         return False
 
 
+def install_package(package_name, version=None, run_as_user="root"):
+    """
+    Installs a package using apt-get, with optional versioning.
+
+    Args:
+        package_name (str): The package name to install.
+        version (str, optional): Specific version to install.
+        run_as_user (str): User context to run command under.
+
+    Returns:
+        bool: True if installation succeeded, False otherwise.
+    """
+    return install_packages([(package_name, version)], run_as_user=run_as_user)
+
+
+def _load_dpkg_status():
+    """
+    Parses the dpkg status database into a package name -> Status field dict.
+
+    The parsed result is reused until the file's modification time changes.
+    """
+    mtime = os.stat(DPKG_STATUS_PATH).st_mtime_ns
+    if _dpkg_status_cache["mtime"] == mtime:
+        return _dpkg_status_cache["packages"]
+
+    with open(DPKG_STATUS_PATH, encoding="utf-8", errors="replace") as f:
+        content = f.read()
+
+    packages = {}
+    for paragraph in content.split("\n\n"):
+        fields = dict(_DPKG_FIELD_RE.findall(paragraph))
+        name, status = fields.get("Package"), fields.get("Status")
+        # Multi-arch packages have one paragraph per architecture; any installed one counts
+        if name and status and packages.get(name) != DPKG_INSTALLED:
+            packages[name] = status
+
+    _dpkg_status_cache["mtime"] = mtime
+    _dpkg_status_cache["packages"] = packages
+    return packages
+
+
 def check_package_installed(package_name, run_as_user="root"):
     """
-    Checks if a package is installed via dpkg.
+    Checks if a package is installed according to the dpkg status database.
+
+    Only "install ok installed" counts; removed packages that left their
+    config files behind do not. Falls back to dpkg -s if the database
+    cannot be read.
 
     Args:
         package_name (str): The name of the package to check.
-        run_as_user (str): User context to run command under.
+        run_as_user (str): User context to run the dpkg fallback under.
 
     Returns:
         bool: True if installed, False otherwise.
     """
     try:
+        return _load_dpkg_status().get(package_name) == DPKG_INSTALLED
+    except OSError:
+        pass
+
+    try:
+        # Only the exit status matters here
         run_command(
             ["dpkg", "-s", package_name],
-            run_as_user=run_as_user
+            run_as_user=run_as_user,
+            capture=False,
         )
         return True
     except Exception:
         return False
 
 
-def handle_package_install(package_name, auto_update_packages=False, run_as_user="root"):
+def handle_packages_install(package_names, auto_update_packages=False, run_as_user="root", skip_installed=True):
     """
-    Orchestrates the full process of installing a package:
-    - Fetches available versions
+    Orchestrates the full process of installing several packages at once:
+    - Skips packages that are already installed (unless auto-updating)
+    - Fetches available versions of every package
     - Prompts user if needed
-    - Installs selected version
+    - Installs all selected versions with one apt-get call
     - Verifies installation
 
+    Packages without any available version are skipped and make the result False.
+
     Args:
-        package_name (str): Name of the package to install.
-        auto_update_packages (bool): If True, selects latest version automatically.
-        log (Logger, optional): Logger instance for output.
+        package_names (list): Names of the packages to install.
+        auto_update_packages (bool): If True, selects latest versions automatically.
         run_as_user (str): User to run installation under.
+        skip_installed (bool): If False, installed packages are offered for
+            reinstall/update even when not auto-updating.
 
     Returns:
-        bool: True if package was installed and verified, False otherwise.
+        bool: True if every package was installed and verified, False otherwise.
     """
-    available_versions = get_available_versions(package_name, run_as_user=run_as_user)
-    if not available_versions:
-        return False
+    if skip_installed and not auto_update_packages:
+        pending = []
+        for package_name in package_names:
+            if check_package_installed(package_name, run_as_user=run_as_user):
+                log.info(f"✅ {package_name} is already installed, skipping.")
+            else:
+                pending.append(package_name)
+        if not pending:
+            return True
+        package_names = pending
 
-    if auto_update_packages:
-        selected_version = available_versions[0]
-        log.info(f"[AUTO] Installing latest version of {package_name}: {selected_version}")
-    else:
-        selected_version = ask_user_choice(
-            f"Select version of {package_name} to install",
-            available_versions,
-            log=log.get_log_file_path()
-        )
+    all_found = True
+    selected = []
+    versions_by_package = get_available_versions_bulk(package_names, run_as_user=run_as_user)
 
-    success = install_package(package_name, selected_version, run_as_user=run_as_user)
-    if not success:
+    for package_name in package_names:
+        available_versions = versions_by_package[package_name]
+        if not available_versions:
+            all_found = False
+            continue
+
+        if auto_update_packages:
+            selected_version = available_versions[0]
+            log.info(f"[AUTO] Installing latest version of {package_name}: {selected_version}")
+        else:
+            selected_version = ask_user_choice(
+                f"Select version of {package_name} to install",
+                available_versions
+            )
+        selected.append((package_name, selected_version))
+
+    if not selected:
         return False
 
-    if not check_package_installed(package_name, run_as_user=run_as_user):
-        log.error(f"❌ Post-installation check failed for {package_name}")
+    success = install_packages(selected, run_as_user=run_as_user)
+    if not success:
         return False
 
-    log.info(f"✅ {package_name} installed successfully.")
-    return True
+    for package_name, _ in selected:
+        if not check_package_installed(package_name, run_as_user=run_as_user):
+            log.error(f"❌ Post-installation check failed for {package_name}")
+            return False
+
+        log.info(f"✅ {package_name} installed successfully.")
+
+    return all_found
+
+
+def handle_package_install(package_name, auto_update_packages=False, run_as_user="root", skip_installed=True):
+    """
+    Orchestrates the full process of installing a package:
+    - Fetches available versions
+    - Prompts user if needed
+    - Installs selected version
+    - Verifies installation
+
+    Args:
+        package_name (str): Name of the package to install.
+        auto_update_packages (bool): If True, selects latest version automatically.
+        run_as_user (str): User to run installation under.
+        skip_installed (bool): If False, an installed package is offered for
+            reinstall/update even when not auto-updating.
+
+    Returns:
+        bool: True if package was installed and verified, False otherwise.
+    """
+    return handle_packages_install(
+        [package_name], auto_update_packages, run_as_user=run_as_user, skip_installed=skip_installed
+    )
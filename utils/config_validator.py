@@ -4,10 +4,31 @@ Ensures that the configuration is valid before proceeding with installation
 """
 
 import os
+import pwd
+import shutil
+import stat
 from utils.logger import logger_instance as log
 from utils.exceptions import ValidationError, ConfigurationError
 
 
+# Users already confirmed to exist; missing users are looked up again each time
+_known_users = set()
+
+# Paths of commands already found on PATH; missing commands are looked up again
+# each time, as they may be installed later in the run
+_command_paths = {}
+
+
+def _which(command):
+    """Resolve a command on PATH, remembering it once found"""
+    path = _command_paths.get(command)
+    if path is None:
+        path = shutil.which(command)
+        if path is not None:
+            _command_paths[command] = path
+    return path
+
+
 def validate_config(config):
     """
     Validate configuration settings
@@ -28,11 +49,15 @@ def validate_config(config):
     if not hasattr(config, 'USER') or not config.USER:
         errors.append("USER must be set in config.py")
     
+    # Paths that must exist, mapped to the warning to report if they don't;
+    # each distinct path is checked once after the application pass
+    paths_to_check = {}
+
     # Check application settings
     if not hasattr(config, 'APPLICATIONS') or not config.APPLICATIONS:
         errors.append("No applications configured in APPLICATIONS")
     else:
-        # Check each application's configuration
+        # Check each application's configuration and paths in a single pass
         for app_name, app_config in config.APPLICATIONS.items():
             if not isinstance(app_config, dict):
                 errors.append(f"Application '{app_name}' configuration must be a dictionary")
@@ -43,16 +68,20 @@ def validate_config(config):
                 
             if "user" not in app_config:
                 warnings.append(f"Application '{app_name}' is missing 'user' key")
-    
-    # Check for valid paths
-    for app_name, app_config in getattr(config, 'APPLICATIONS', {}).items():
-        if app_name == "retropie" and app_config.get("enabled", False):
-            if not hasattr(config, 'RETROPIE_LOCAL_PATH') or not config.RETROPIE_LOCAL_PATH:
-                errors.append("RETROPIE_LOCAL_PATH must be set when RetroPie is enabled")
-                
-            if hasattr(config, 'RETROPIE_SOURCE_PATH') and config.RETROPIE_SOURCE_PATH:
-                if not os.path.exists(config.RETROPIE_SOURCE_PATH):
-                    warnings.append(f"RETROPIE_SOURCE_PATH '{config.RETROPIE_SOURCE_PATH}' does not exist")
+
+            if app_name == "retropie" and app_config.get("enabled", False):
+                if not hasattr(config, 'RETROPIE_LOCAL_PATH') or not config.RETROPIE_LOCAL_PATH:
+                    errors.append("RETROPIE_LOCAL_PATH must be set when RetroPie is enabled")
+
+                if hasattr(config, 'RETROPIE_SOURCE_PATH') and config.RETROPIE_SOURCE_PATH:
+                    paths_to_check.setdefault(
+                        config.RETROPIE_SOURCE_PATH,
+                        f"RETROPIE_SOURCE_PATH '{config.RETROPIE_SOURCE_PATH}' does not exist"
+                    )
+
+    for path, warning in paths_to_check.items():
+        if not os.path.exists(path):
+            warnings.append(warning)
     
     # Check system settings
     if not hasattr(config, 'TESTED_OS_VERSION') or not config.TESTED_OS_VERSION:
@@ -92,14 +121,17 @@ def validate_user_exists(username):
     Raises:
         ValidationError: If user does not exist
     """
-    import pwd
-    
+    if username in _known_users:
+        return True
+
     try:
         pwd.getpwnam(username)
-        return True
     except KeyError:
         raise ValidationError(f"User '{username}' does not exist on the system")
 
+    _known_users.add(username)
+    return True
+
 
 def validate_path_exists(path, create=False, is_dir=True):
     """
@@ -116,10 +148,16 @@ def validate_path_exists(path, create=False, is_dir=True):
     Raises:
         ValidationError: If path does not exist and could not be created
     """
-    if os.path.exists(path):
-        if is_dir and not os.path.isdir(path):
+    # A single stat answers both "does it exist" and "is it a directory"
+    try:
+        path_is_dir = stat.S_ISDIR(os.stat(path).st_mode)
+    except OSError:
+        path_is_dir = None
+
+    if path_is_dir is not None:
+        if is_dir and not path_is_dir:
             raise ValidationError(f"Path '{path}' exists but is not a directory")
-        elif not is_dir and os.path.isdir(path):
+        elif not is_dir and path_is_dir:
             raise ValidationError(f"Path '{path}' exists but is a directory, not a file")
         return True
     
@@ -155,9 +193,7 @@ def validate_command_exists(command):
     Raises:
         ValidationError: If command does not exist
     """
-    import shutil
-    
-    if shutil.which(command):
+    if _which(command):
         return True
     
     raise ValidationError(f"Command '{command}' not found in PATH")
@@ -3,8 +3,8 @@ Centralized error handling for RPi-DYS-Multimedia
 Provides decorators and utilities for consistent error handling
 """
 
+import contextlib
 import functools
-import traceback
 import sys
 from utils.logger import logger_instance as log
 from utils.exceptions import RPiDysError
@@ -37,7 +37,7 @@ def handle_error(exit_on_error=False, return_value=False):
             except Exception as e:
                 # Unexpected error
                 log.error(f"Unexpected error: {type(e).__name__}: {str(e)}")
-                log.debug(f"Exception details:\n{traceback.format_exc()}")
+                log.log_traceback(e)
                 
                 if exit_on_error:
                     log.error("Exiting due to unexpected error.")
@@ -47,10 +47,13 @@ def handle_error(exit_on_error=False, return_value=False):
     return decorator
 
 
+@contextlib.contextmanager
 def try_operation(operation_name):
     """
     Context manager for error handling
     
+    Errors raised inside the block are logged and suppressed.
+
     Args:
         operation_name: Name of the operation for logging
         
@@ -58,28 +61,16 @@ def try_operation(operation_name):
         with try_operation("Installing package"):
             install_package()
     """
-    class OperationContext:
-        def __init__(self, name):
-            self.name = name
-            
-        def __enter__(self):
-            log.info(f"Starting: {self.name}")
-            return self
-            
-        def __exit__(self, exc_type, exc_val, exc_tb):
-            if exc_type is None:
-                log.info(f"Completed: {self.name}")
-                return False
-                
-            if issubclass(exc_type, RPiDysError):
-                log.error(f"Error in {self.name}: {exc_val}")
-            else:
-                log.error(f"Unexpected error in {self.name}: {exc_val}")
-                log.debug(f"Exception details:\n{traceback.format_exc()}")
-                
-            return True  # Suppress the exception
-            
-    return OperationContext(operation_name)
+    log.info(f"Starting: {operation_name}")
+    try:
+        yield
+    except RPiDysError as e:
+        log.error(f"Error in {operation_name}: {e}")
+    except Exception as e:
+        log.error(f"Unexpected error in {operation_name}: {e}")
+        log.log_traceback(e)
+    else:
+        log.info(f"Completed: {operation_name}")
 
 
 def safe_function(func):
@@ -99,6 +90,6 @@ def safe_function(func):
             return func(*args, **kwargs)
         except Exception as e:
             log.error(f"Error in {func.__name__}: {str(e)}")
-            log.debug(f"Exception details:\n{traceback.format_exc()}")
+            log.log_traceback(e)
             return None
     return wrapper
@@ -9,27 +9,25 @@ def ask_user_choice(question, options):
 
     if isinstance(options, dict):
         option_list = list(options.items())  # Convert dict to list of tuples (key, value)
+        normalized = {str(k).lower(): k for k in options}  # Case-insensitive key lookup
     else:
         option_list = list(enumerate(options, 1))  # Convert list to indexed options
+        option_count = len(options)
 
-    # Log the question
-    log.info(f"\n{question}:")
-
-    # Display options
-    for idx, val in option_list:
-        log.info(f"{idx}) {val}")
+    # Log the question and the options as a single message
+    menu = "\n".join(f"{idx}) {val}" for idx, val in option_list)
+    log.info(f"\n{question}:\n{menu}")
 
     while True:
         choice = input("Enter your choice: ").strip()
 
         if isinstance(options, dict):  # Handle dictionary input
-            normalized = {str(k).lower(): k for k in options}
             if choice.lower() in normalized:
                 return normalized[choice.lower()]
         else:  # Handle list input
             try:
                 choice_int = int(choice)
-                if 1 <= choice_int <= len(options):
+                if 1 <= choice_int <= option_count:
                     return options[choice_int - 1]
             except ValueError:
                 pass
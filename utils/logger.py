@@ -1,9 +1,69 @@
-﻿import logging
+﻿import atexit
+import logging
+import logging.handlers
 import os
+import queue
 import sys
-import traceback
-from datetime import datetime
+import time
 from contextlib import contextmanager
+from functools import lru_cache
+
+
+class BufferedFileHandler(logging.StreamHandler):
+    """
+    File handler that buffers debug records and flushes everything else.
+
+    Records at flush_level or above and raw command output (already batched by
+    run_command) are flushed right away, so `tail -f` on the log stays live
+    during long installs. Debug records collect in the buffer until the next
+    flush, when it fills, or on close (logging.shutdown closes all handlers at a
+    clean interpreter exit); a crash can lose only those buffered debug records.
+    """
+
+    def __init__(self, filename, buffer_size=65536, flush_level=logging.INFO):
+        super().__init__(open(filename, "a", encoding="utf-8", buffering=buffer_size))
+        self.baseFilename = os.path.abspath(filename)
+        self.flush_level = flush_level
+
+    def emit(self, record):
+        try:
+            # Raw records carry preformatted text that is written as is
+            msg = record.getMessage() if getattr(record, "raw", False) else self.format(record)
+            # Two writes into the buffer avoid copying msg to append the newline
+            self.stream.write(msg)
+            self.stream.write(self.terminator)
+            if record.levelno >= self.flush_level or getattr(record, "raw", False):
+                self.flush()
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
+
+    def close(self):
+        with self.lock:
+            try:
+                if self.stream:
+                    try:
+                        self.flush()
+                    finally:
+                        self.stream.close()
+                        self.stream = None
+            finally:
+                super().close()
+
+
+class UnformattedQueueHandler(logging.handlers.QueueHandler):
+    """
+    Queue handler that enqueues records as they are.
+
+    The stock prepare() formats every record on the calling thread, only for the
+    listener's handler to format it again; here formatting happens once, on the
+    listener thread.
+    """
+
+    def prepare(self, record):
+        return record
+
 
 class Logger:
     def __init__(self, log_dir=None, console_level=logging.INFO, file_level=logging.DEBUG):
@@ -20,6 +80,8 @@ class Logger:
         self.console_level = console_level
         self.file_level = file_level
         self.section_level = 0  # For tracking nested log sections
+        self._log_queue = None  # Queue feeding the file listener, set by _setup_handlers
+        self._listener = None
 
         # ✅ Prevent adding handlers more than once
         self.logger = logging.getLogger("rpi_dys_logger")
@@ -39,49 +101,52 @@ class Logger:
         # Import here to avoid circular imports
         import config
 
-        # Set proper ownership if running as root
+        # When running as root, look up the configured user once; its uid/gid
+        # are used to hand the log directory, symlink and file over to it
+        owner = None
         if os.geteuid() == 0 and hasattr(config, 'USER'):
             try:
                 import pwd
                 import grp
-                user = config.USER
-                uid = pwd.getpwnam(user).pw_uid
-                gid = grp.getgrnam(user).gr_gid
-                os.chown(self.log_dir, uid, gid)
+                owner = (pwd.getpwnam(config.USER).pw_uid, grp.getgrnam(config.USER).gr_gid)
+            except Exception as e:
+                print(f"Warning: Could not set ownership of log files: {e}")
+
+        # Set proper ownership if running as root
+        if owner:
+            try:
+                os.chown(self.log_dir, *owner)
             except Exception as e:
                 print(f"Warning: Could not set ownership of log directory: {e}")
 
         # Create timestamped log file
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        timestamp = time.strftime("%Y%m%d_%H%M%S")
         log_file = os.path.join(self.log_dir, f"rpi_dys_{timestamp}.log")
         self.log_file_path = log_file
 
-        # Create a symlink to the latest log
+        # Create a symlink to the latest log, atomically replacing the old one
         latest_link = os.path.join(self.log_dir, "rpi_dys_latest.log")
-        if os.path.exists(latest_link) or os.path.islink(latest_link):
-            try:
-                os.remove(latest_link)
-            except Exception as e:
-                print(f"Warning: Could not remove old symlink: {e}")
-
+        tmp_link = latest_link + ".tmp"
         try:
-            os.symlink(log_file, latest_link)
+            try:
+                os.unlink(tmp_link)
+            except FileNotFoundError:
+                pass
+            os.symlink(log_file, tmp_link)
+            os.replace(tmp_link, latest_link)
 
             # Set proper ownership of the symlink if running as root
-            if os.geteuid() == 0 and hasattr(config, 'USER'):
+            if owner:
                 try:
-                    user = config.USER
-                    uid = pwd.getpwnam(user).pw_uid
-                    gid = grp.getgrnam(user).gr_gid
                     # Use lchown to change ownership of the symlink itself
-                    os.lchown(latest_link, uid, gid)
+                    os.lchown(latest_link, *owner)
                 except Exception as e:
                     print(f"Warning: Could not set ownership of symlink: {e}")
         except Exception as e:
             print(f"Warning: Could not create symlink to latest log: {e}")
 
-        # File handler with detailed formatting
-        file_handler = logging.FileHandler(log_file)
+        # Buffered file handler with detailed formatting
+        file_handler = BufferedFileHandler(log_file)
         file_handler.setLevel(self.file_level)
         file_formatter = logging.Formatter(
             '%(asctime)s - %(levelname)s - %(filename)s:%(lineno)d - %(message)s'
@@ -92,12 +157,9 @@ class Logger:
         os.chmod(log_file, 0o644)
 
         # Set proper ownership if running as root
-        if os.geteuid() == 0 and hasattr(config, 'USER'):
+        if owner:
             try:
-                user = config.USER
-                uid = pwd.getpwnam(user).pw_uid
-                gid = grp.getgrnam(user).gr_gid
-                os.chown(log_file, uid, gid)
+                os.chown(log_file, *owner)
             except Exception as e:
                 print(f"Warning: Could not set ownership of log file: {e}")
 
@@ -106,45 +168,85 @@ class Logger:
         console_handler.setLevel(self.console_level)
         console_formatter = logging.Formatter('%(levelname)s: %(message)s')
         console_handler.setFormatter(console_formatter)
+        console_handler.addFilter(lambda record: not getattr(record, "raw", False))
+
+        # File output goes through a queue of unformatted records, so formatting and
+        # disk writes happen on a listener thread. The console handler stays
+        # synchronous so log output keeps its order relative to print() and input() prompts.
+        log_queue = self._log_queue = queue.Queue(-1)
+        queue_handler = self._queue_handler = UnformattedQueueHandler(log_queue)
+        queue_handler.setLevel(self.file_level)
+        self._listener = logging.handlers.QueueListener(log_queue, file_handler, respect_handler_level=True)
+        self._listener.start()
+        atexit.register(self.close)
 
         # Add handlers
-        self.logger.addHandler(file_handler)
+        self.logger.addHandler(queue_handler)
         self.logger.addHandler(console_handler)
 
-    def debug(self, message):
-        self.logger.debug(message)
+    def is_enabled_for(self, level):
+        """Return True if a record at this level would reach at least one handler"""
+        if not self.logger.isEnabledFor(level):
+            return False
+        return any(level >= handler.level for handler in self.logger.handlers)
 
-    def info(self, message):
-        self.logger.info(message)
+    def debug(self, msg, *args, **kwargs):
+        self.logger.debug(msg, *args, **kwargs)
 
-    def warning(self, message):
-        self.logger.warning(message)
+    def info(self, msg, *args, **kwargs):
+        self.logger.info(msg, *args, **kwargs)
 
-    def error(self, message):
-        self.logger.error(message)
+    def warning(self, msg, *args, **kwargs):
+        self.logger.warning(msg, *args, **kwargs)
 
-    def critical(self, message):
-        self.logger.critical(message)
+    def error(self, msg, *args, **kwargs):
+        self.logger.error(msg, *args, **kwargs)
+
+    def critical(self, msg, *args, **kwargs):
+        self.logger.critical(msg, *args, **kwargs)
 
     def tail_note(self):
         self.info(
-            f"📡 You can monitor progress in another terminal with:\n"
-            f"    tail -f {self.log_file_path}"
+            "📡 You can monitor progress in another terminal with:\n"
+            "    tail -f %s",
+            self.log_file_path
         )
 
+    def close(self):
+        """Write out all queued records and flush the log file"""
+        if self._listener is not None:
+            listener, self._listener = self._listener, None
+            listener.stop()
+            # Anything logged afterwards goes straight to the file
+            self._log_queue = None
+            self.logger.removeHandler(self._queue_handler)
+            for handler in listener.handlers:
+                self.logger.addHandler(handler)
+                handler.flush()
+
     def get_log_file_path(self):
         return self.log_file_path
 
     def log_only_no_indicator(self, message):
         """Log a message to file only without any formatting"""
-        for handler in self.logger.handlers:
-            if isinstance(handler, logging.FileHandler):
-                handler.acquire()
-                try:
-                    handler.stream.write(message + '\n')
-                    handler.flush()
-                finally:
-                    handler.release()
+        # Queued like any other record so it stays in order with them. Raw lines
+        # need no caller info or formatting, so when the queue is known the record
+        # is built directly and the logger/handler dispatch is skipped.
+        if self._log_queue is None:
+            self.logger.log(self.file_level, message, extra={"raw": True})
+            return
+        self._log_queue.put_nowait(logging.makeLogRecord({
+            "name": self.logger.name,
+            "msg": message,
+            "levelno": self.file_level,
+            "levelname": logging.getLevelName(self.file_level),
+            "raw": True,
+        }))
+
+    def log_only_no_indicator_many(self, lines):
+        """Log several lines to file only without any formatting, as one record"""
+        if lines:
+            self.log_only_no_indicator("\n".join(lines))
 
     @contextmanager
     def log_section(self, title, level=logging.INFO):
@@ -153,53 +255,87 @@ class Logger:
         indent = "  " * (self.section_level - 1)
         separator = "=" * (50 - len(indent))
 
-        self.logger.log(level, f"\n{indent}{separator}")
-        self.logger.log(level, f"{indent}STARTING: {title}")
-        self.logger.log(level, f"{indent}{separator}")
+        self.logger.log(level, "\n%s%s", indent, separator)
+        self.logger.log(level, "%sSTARTING: %s", indent, title)
+        self.logger.log(level, "%s%s", indent, separator)
 
         try:
             yield
         except Exception as e:
-            self.error(f"{indent}ERROR in {title}: {str(e)}")
-            self.debug(f"Exception details:\n{traceback.format_exc()}")
+            self.error("%sERROR in %s: %s", indent, title, e)
+            self.log_traceback(e)
             raise
         finally:
-            self.logger.log(level, f"\n{indent}{separator}")
-            self.logger.log(level, f"{indent}COMPLETED: {title}")
-            self.logger.log(level, f"{indent}{separator}")
+            self.logger.log(level, "\n%s%s", indent, separator)
+            self.logger.log(level, "%sCOMPLETED: %s", indent, title)
+            self.logger.log(level, "%s%s", indent, separator)
             self.section_level -= 1
 
     def log_exception(self, e, message=None):
         """Log an exception with traceback"""
         if message:
-            self.error(f"{message}: {str(e)}")
+            self.error("%s: %s", message, e)
         else:
-            self.error(str(e))
-        self.debug(f"Exception details:\n{traceback.format_exc()}")
+            self.error("%s", e)
+        self.log_traceback(e)
+
+    def log_traceback(self, e):
+        """Log the traceback of an exception at debug level, once per exception"""
+        # Nested log sections and the final handler all see the same exception;
+        # the traceback is only formatted (by the handler) the first time
+        if getattr(e, "_traceback_logged", False) or not self.is_enabled_for(logging.DEBUG):
+            return
+        self.debug("Exception details:", exc_info=(type(e), e, e.__traceback__))
+        try:
+            e._traceback_logged = True
+        except AttributeError:
+            pass
 
     def log_command(self, command):
         """Log a command that's about to be executed"""
+        if not self.is_enabled_for(logging.DEBUG):
+            return
         if isinstance(command, list):
             cmd_str = ' '.join(command)
         else:
             cmd_str = command
-        self.debug(f"Executing command: {cmd_str}")
+        self.debug("Executing command: %s", cmd_str)
 
     def log_result(self, return_code, output):
         """Log the result of a command"""
+        if not self.is_enabled_for(logging.DEBUG):
+            return
         status = "SUCCESS" if return_code == 0 else f"FAILED (code: {return_code})"
-        self.debug(f"Command {status}")
+        self.debug("Command %s", status)
         if output:
-            # Log first few lines of output at debug level
-            lines = output.splitlines()
-            preview = "\n".join(lines[:5])
-            if len(lines) > 5:
-                preview += "\n... (output truncated)"
-            self.debug(f"Output preview:\n{preview}")
+            # Log first few lines of output at debug level; only scan as far as
+            # the end of the fifth line rather than splitting the whole output
+            end = -1
+            for _ in range(5):
+                end = output.find("\n", end + 1)
+                if end == -1:
+                    break
+            if end == -1:
+                preview = output[:-1] if output.endswith("\n") else output
+            else:
+                preview = output[:end]
+                if end + 1 < len(output):
+                    preview += "\n... (output truncated)"
+            self.debug("Output preview:\n%s", preview)
+
+@lru_cache(maxsize=None)
+def get_logger():
+    """Get the global logger instance, creating it on first use"""
+    return Logger()
 
-# Singleton pattern to access logger instance globally
-logger_instance = Logger()
 
-def get_logger():
-    """Get the global logger instance"""
-    return logger_instance
+class _LazyLogger:
+    """Stand-in for the global Logger that only creates it when first used"""
+
+    def __getattr__(self, name):
+        return getattr(get_logger(), name)
+
+
+# Singleton pattern to access logger instance globally; importing this module
+# no longer creates the log directory and file, the first log call does
+logger_instance = _LazyLogger()
@@ -1,46 +1,93 @@
-﻿import os
+﻿import codecs
+import logging
+import math
+import os
 import sys
 import subprocess
 import shutil
 import pwd
+import re
+import selectors
 import time
+from functools import lru_cache
 from utils.logger import logger_instance as log
 import shlex
 
+# Size of the reads run_command uses to drain command output
+READ_CHUNK_SIZE = 65536
 
+# Longest time (seconds) run_command holds complete output lines before logging them
+LOG_FLUSH_INTERVAL = 0.05
+
+# Shell syntax (pipes, redirection, expansion, globbing, env assignments...) that
+# needs bash; string commands without any of it are split and run directly
+_NEEDS_SHELL = re.compile(r"[|&;<>()$`\\*?\[\]{}~!#\n]|^\s*\w+=")
+
+
+@lru_cache(maxsize=None)
 def is_running_as_root():
     """Check if the script is run with sudo or as root."""
     return os.geteuid() == 0
 
+# Commands already found on PATH; missing ones are looked up again each time,
+# as an install step later in the run may provide them
+_available_commands = set()
+
 def is_command_available(command):
-    return shutil.which(command) is not None
+    if command in _available_commands:
+        return True
+    if shutil.which(command) is None:
+        return False
+    _available_commands.add(command)
+    return True
+
+OS_RELEASE_PATH = "/etc/os-release"
 
+@lru_cache(maxsize=None)
 def get_codename() -> str:
     """
     Returns the OS codename (e.g., 'bookworm', 'bullseye').
+    Read from /etc/os-release, falling back to lsb_release when that has no codename.
     """
+    try:
+        with open(OS_RELEASE_PATH) as f:
+            for line in f:
+                if line.startswith("VERSION_CODENAME="):
+                    codename = line.split("=", 1)[1].strip().strip('"').lower()
+                    if codename:
+                        return codename
+    except OSError:
+        pass
+
     try:
         output = subprocess.check_output(['lsb_release', '-cs'], text=True).strip().lower()
         return output
-    except subprocess.CalledProcessError:
+    except (OSError, subprocess.CalledProcessError):
+        # lsb_release is missing or failed
         return "unknown"
 
+@lru_cache(maxsize=16)
+def _lowered(versions: tuple) -> frozenset:
+    """Lowercased set of version names, built once per distinct version list."""
+    return frozenset(ver.lower() for ver in versions)
+
 def is_supported(current_codename: str, tested_versions: list) -> bool:
     """
     Checks if the current OS codename is in the list of tested versions.
     """
-    return current_codename in [ver.lower() for ver in tested_versions]
+    return current_codename in _lowered(tuple(tested_versions))
+
+PI_MODEL_PATHS = ("/proc/device-tree/model", "/sys/firmware/devicetree/base/model")
 
+@lru_cache(maxsize=None)
 def get_raspberry_pi_model():
-    try:
-        with open("/proc/device-tree/model", "r") as f:
-            return f.read().strip("\x00\n ")
-    except FileNotFoundError:
+    for path in PI_MODEL_PATHS:
         try:
-            result = subprocess.run(["cat", "/sys/firmware/devicetree/base/model"], capture_output=True, text=True)
-            return result.stdout.strip("\x00\n ")
-        except Exception:
-            return "Unknown"
+            with open(path, "rb") as f:
+                return f.read().decode(errors="replace").strip("\x00\n ")
+        except OSError:
+            continue
+    return "Unknown"
 
 def reboot_countdown(seconds=10):
     print("\n🔁 System will reboot in {} seconds...".format(seconds))
@@ -48,17 +95,47 @@ def reboot_countdown(seconds=10):
     print("\n📌 After reboot, re-run the script and choose the next step to continue.\n")
 
     try:
-        for i in range(seconds, 0, -1):
-            sys.stdout.write(f"\r💤 Rebooting in {i:2d} seconds... ")
-            sys.stdout.flush()
-            time.sleep(1)
+        # Sleep in short steps against a monotonic deadline so Ctrl+C is handled
+        # promptly; the countdown line is only rewritten when the second changes
+        # Each tick goes straight to the terminal as one pre-encoded write
+        prefix_text, suffix_text = "\r💤 Rebooting in ", " seconds... "
+        encoding = getattr(sys.stdout, "encoding", None) or "utf-8"
+        prefix = prefix_text.encode(encoding, "replace")
+        suffix = suffix_text.encode(encoding, "replace")
+        try:
+            stdout_fd = sys.stdout.fileno()
+        except (AttributeError, OSError, ValueError):
+            # stdout has no file descriptor (e.g. replaced by a StringIO): write through it
+            stdout_fd = None
+        sys.stdout.flush()
+        deadline = time.monotonic() + seconds
+        shown = None
+        remaining = seconds
+        while remaining > 0:
+            current = math.ceil(remaining)
+            if current != shown:
+                if stdout_fd is None:
+                    sys.stdout.write(f"{prefix_text}{current:2d}{suffix_text}")
+                    sys.stdout.flush()
+                else:
+                    os.write(stdout_fd, prefix + b"%2d" % current + suffix)
+                shown = current
+            time.sleep(min(0.05, remaining))
+            remaining = deadline - time.monotonic()
         print("\n\n🚀 Rebooting now...")
         time.sleep(1)
-        os.system("sudo reboot")
+        # exec replaces this process, so exit handlers never run: flush the log first
+        log.close()
+        sys.stdout.flush()
+        try:
+            os.execvp("sudo", ["sudo", "reboot"])
+        except OSError as e:
+            log.error(f"❌ Could not run 'sudo reboot': {e}. Please reboot manually.")
     except KeyboardInterrupt:
         print("\n❌ Reboot cancelled. You're still in control. ✋")
 
 
+@lru_cache(maxsize=None)
 def get_home_directory():
     """
     Returns the home directory of the user running the script, even when executed with sudo.
@@ -67,13 +144,36 @@ def get_home_directory():
         return os.path.expanduser(f"~{os.environ['SUDO_USER']}")
     return os.path.expanduser("~")
 
+@lru_cache(maxsize=None)
 def get_username():
     """
     Returns the name of the non-root user, even when running with sudo.
     """
     return os.environ.get("SUDO_USER") or os.environ.get("USER") or pwd.getpwuid(os.getuid()).pw_name
 
-def run_command(command, run_as_user=None, cwd=None, use_bash_wrapper=True):
+class _OutputReader:
+    """Splits one output stream of run_command into complete lines."""
+
+    def __init__(self, log_prefix):
+        self.log_prefix = log_prefix
+        self.decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        self.partial = ""
+
+    def feed(self, chunk):
+        """
+        Return the lines completed by chunk, each with its trailing newline; an
+        empty chunk marks the end of the stream and also returns an unterminated
+        last line as is.
+        """
+        lines = (self.partial + self.decoder.decode(chunk, final=not chunk)).split("\n")
+        self.partial = lines.pop()
+        lines = [line + "\n" for line in lines]
+        if not chunk and self.partial:
+            lines.append(self.partial)
+            self.partial = ""
+        return lines
+
+def run_command(command, run_as_user=None, cwd=None, use_bash_wrapper=True, keep_output=True, capture=True):
     """
     Run a shell command with optional user context and log output line-by-line.
 
@@ -81,37 +181,87 @@ def run_command(command, run_as_user=None, cwd=None, use_bash_wrapper=True):
         command (list or str): Command to run.
         run_as_user (str, optional): Username to run the command as (requires sudo).
         cwd (str, optional): Directory to run the command from.
-        use_bash_wrapper (bool): If True and command is a string, run via bash -c.
+        use_bash_wrapper (bool): If True and command is a string, run via bash -c
+            when it uses shell syntax, otherwise split it with shlex and run it directly.
+        keep_output (bool): If False, output is only logged as it streams and not
+            kept in memory; the returned output is then empty.
+        capture (bool): If False, output is discarded (sent to /dev/null) instead
+            of being read and logged; the returned output is then empty.
 
     Returns:
         tuple[int, str]: Return code and full output of the command.
     """
     if isinstance(command, str) and use_bash_wrapper:
-        command = ["bash", "-c", command]
+        if _NEEDS_SHELL.search(command):
+            command = ["bash", "-c", command]
+        else:
+            command = shlex.split(command)
 
     if run_as_user and run_as_user != "root":
         command = ["sudo", "-u", run_as_user] + command
 
-    log.info(f"Running command: {' '.join(command)}")
+    if log.is_enabled_for(logging.INFO):
+        log.info("Running command: %s", ' '.join(command))
 
     try:
+        if not capture:
+            # The kernel discards the output; there is no pipe to drain
+            return_code = subprocess.call(
+                command,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                cwd=cwd,
+            )
+            if return_code != 0:
+                raise subprocess.CalledProcessError(return_code, command, output="")
+            return return_code, ""
+
         output_lines = []
         process = subprocess.Popen(
             command,
             stdout=subprocess.PIPE,
-            stderr=subprocess.STDOUT,
+            stderr=subprocess.PIPE,
             cwd=cwd,
-            text=True,
-            bufsize=1,
-            universal_newlines=True,
+            bufsize=0,
         )
 
-        for line in process.stdout:
-            log.log_only_no_indicator(line.strip())
-            output_lines.append(line)
+        # Drain stdout and stderr in large raw reads as either becomes readable, and
+        # log complete lines in batches at most every LOG_FLUSH_INTERVAL seconds
+        # (chatty commands often deliver a line per read). stderr lines are marked
+        # in the log so they can be told apart from normal output.
+        selector = selectors.DefaultSelector()
+        selector.register(process.stdout, selectors.EVENT_READ, _OutputReader(""))
+        selector.register(process.stderr, selectors.EVENT_READ, _OutputReader("[stderr] "))
+        pending = []
+        last_flush = time.monotonic()
+        try:
+            while selector.get_map():
+                # Wake up in time to log held lines even if the command goes quiet
+                timeout = None
+                if pending:
+                    timeout = max(0, LOG_FLUSH_INTERVAL - (time.monotonic() - last_flush))
+                for key, _ in selector.select(timeout):
+                    chunk = os.read(key.fd, READ_CHUNK_SIZE)
+                    reader = key.data
+                    for line in reader.feed(chunk):
+                        pending.append(reader.log_prefix + line.strip())
+                        if keep_output:
+                            output_lines.append(line)
+                    if not chunk:
+                        selector.unregister(key.fileobj)
+                now = time.monotonic()
+                if pending and (not selector.get_map() or now - last_flush >= LOG_FLUSH_INTERVAL):
+                    log.log_only_no_indicator_many(pending)
+                    pending = []
+                    last_flush = now
+        finally:
+            selector.close()
+            process.stdout.close()
+            process.stderr.close()
 
         return_code = process.wait()
-        full_output = ''.join(output_lines)
+        # Match text mode's universal newlines for callers parsing the output
+        full_output = ''.join(output_lines).replace("\r\n", "\n").replace("\r", "\n")
 
         if return_code != 0:
             raise subprocess.CalledProcessError(return_code, command, output=full_output)
@@ -119,10 +269,10 @@ def run_command(command, run_as_user=None, cwd=None, use_bash_wrapper=True):
         return return_code, full_output
 
     except subprocess.CalledProcessError as e:
-        log.error(f"Command failed with return code {e.returncode}: {' '.join(command)}")
+        log.error("Command failed with return code %s: %s", e.returncode, ' '.join(command))
         raise
 
     except Exception as e:
-        log.error(f"Error occurred while running command: {' '.join(command)}\n{str(e)}")
+        log.error("Error occurred while running command: %s\n%s", ' '.join(command), e)
         raise
 
@@ -1,7 +1,23 @@
 ﻿import os
-import xml.etree.ElementTree as ET
+
+# Use lxml's C parser/serializer when it is installed; the calls used here are the
+# same in both libraries
+try:
+    from lxml import etree as ET
+except ImportError:
+    import xml.etree.ElementTree as ET
 from utils.logger import logger_instance as log
 
+# Parsed trees of files this module has read or written, keyed by path, with the
+# (mtime_ns, size) they had at the time; reused while the file is unchanged
+_tree_cache = {}
+
+
+def _file_version(xml_file):
+    st = os.stat(xml_file)
+    return st.st_mtime_ns, st.st_size
+
+
 def insert_xml_if_missing(xml_file, target_key, xml_block):
     """
     Inserts an XML <source> block into a specific section of an existing XML file
@@ -12,44 +28,90 @@ def insert_xml_if_missing(xml_file, target_key, xml_block):
         target_key (str): The key indicating the section to modify, e.g., 'sources-files' (will extract 'files').
         xml_block (str): The raw XML block to insert (must be a valid <source> element).
     """
+    insert_xml_blocks_if_missing(xml_file, [(target_key, xml_block)])
+
+
+def insert_xml_blocks_if_missing(xml_file, items):
+    """
+    Inserts several XML <source> blocks into an existing XML file, skipping those
+    that already exist. The file is parsed once and written at most once.
+
+    Args:
+        xml_file (str): Path to the XML file to modify.
+        items (list): (target_key, xml_block) pairs, as taken by insert_xml_if_missing.
+    """
 
-    if not os.path.exists(xml_file):
+    try:
+        version = _file_version(xml_file)
+    except FileNotFoundError:
+        _tree_cache.pop(xml_file, None)
         log.error(f"❌ XML file not found: {xml_file}")
         raise FileNotFoundError(f"XML file not found: {xml_file}")
 
-    # Extract the section name (e.g., 'files') from 'sources-files'
-    try:
-        section_tag = target_key.split("-")[1]
-    except IndexError:
-        log.error(f"❌ Invalid target section key: {target_key}")
-        raise ValueError(f"Invalid target section key: {target_key}")
+    # Validate the (small) new blocks before parsing the whole file
+    new_sources = []
+    for target_key, xml_block in items:
+        # Extract the section name (e.g., 'files') from 'sources-files'
+        try:
+            section_tag = target_key.split("-")[1]
+        except IndexError:
+            log.error(f"❌ Invalid target section key: {target_key}")
+            raise ValueError(f"Invalid target section key: {target_key}")
+
+        try:
+            new_elem = ET.fromstring(xml_block.strip())
+        except ET.ParseError as e:
+            log.error(f"❌ Invalid XML block: {e}")
+            raise ValueError(f"Invalid XML block: {e}")
 
-    tree = ET.parse(xml_file)
+        new_sources.append((section_tag, new_elem))
+
+    cached = _tree_cache.get(xml_file)
+    if cached is not None and cached[0] == version:
+        tree = cached[1]
+    else:
+        tree = ET.parse(xml_file)
     root = tree.getroot()
 
-    target_section = root.find(section_tag)
-    if target_section is None:
-        target_section = ET.SubElement(root, section_tag)
-        log.info(f"ℹ️ Created missing section <{section_tag}> in XML.")
+    # Names and paths of the <source> entries in each section touched so far
+    existing_by_section = {}
+    changed = False
 
-    try:
-        new_elem = ET.fromstring(xml_block.strip())
-    except ET.ParseError as e:
-        log.error(f"❌ Invalid XML block: {e}")
-        raise ValueError(f"Invalid XML block: {e}")
-
-    new_name = new_elem.findtext("name")
-    new_path = new_elem.findtext("path")
-
-    # Check if a <source> with the same name or path already exists
-    for existing in target_section.findall("source"):
-        existing_name = existing.findtext("name")
-        existing_path = existing.findtext("path")
-        if existing_name == new_name or existing_path == new_path:
+    for section_tag, new_elem in new_sources:
+        if section_tag not in existing_by_section:
+            target_section = root.find(section_tag)
+            if target_section is None:
+                target_section = ET.SubElement(root, section_tag)
+                changed = True
+                log.info(f"ℹ️ Created missing section <{section_tag}> in XML.")
+            names, paths = set(), set()
+            for existing in target_section.iterfind("source"):
+                names.add(existing.findtext("name"))
+                paths.add(existing.findtext("path"))
+            existing_by_section[section_tag] = (target_section, names, paths)
+
+        target_section, names, paths = existing_by_section[section_tag]
+        new_name = new_elem.findtext("name")
+        new_path = new_elem.findtext("path")
+
+        # Check if a <source> with the same name or path already exists
+        if new_name in names or new_path in paths:
             log.info(f"✅ Source '{new_name}' already exists — skipping.")
-            return
+            continue
+
+        # Append new source
+        target_section.append(new_elem)
+        names.add(new_name)
+        paths.add(new_path)
+        changed = True
+        log.info(f"✅ Inserted source '{new_name}' into <{section_tag}>.")
 
-    # Append new source
-    target_section.append(new_elem)
-    tree.write(xml_file, encoding="utf-8", xml_declaration=True)
-    log.info(f"✅ Inserted source '{new_name}' into <{section_tag}>.")
+    if changed:
+        try:
+            tree.write(xml_file, encoding="utf-8", xml_declaration=True)
+            version = _file_version(xml_file)
+        except Exception:
+            # The in-memory tree no longer matches the file
+            _tree_cache.pop(xml_file, None)
+            raise
+    _tree_cache[xml_file] = (version, tree)